@@ -0,0 +1,60 @@
+"""Compare the fused summary kernel with the notebook's chain of pandas calls.
+
+Usage: python benchmarks/bench_fused.py --rows 1500 --columns 10000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_return.fused import fused_summary_from_navs  # noqa: E402
+from risk_return.synthetic import generate_navs  # noqa: E402
+
+
+def pandas_chain(navs):
+    # Same sequence of calls as risk_return_analysis.ipynb
+    daily_returns = navs.pct_change().dropna()
+    cumulative = (1 + daily_returns).cumprod()
+    std_sorted = daily_returns.std().sort_values()
+    annualized_std = std_sorted * np.sqrt(252)
+    annualized_return = (daily_returns.mean() * 252).sort_values()
+    sharpe = annualized_return / (daily_returns.std() * np.sqrt(252))
+    return annualized_std, sharpe, cumulative.iloc[-1]
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1500)
+    parser.add_argument("--columns", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    navs = generate_navs(args.rows, args.columns - 1)
+
+    pandas_time, (_, pandas_sharpe, pandas_cumulative) = best_of(lambda: pandas_chain(navs), args.repeat)
+    fused_time, table = best_of(lambda: fused_summary_from_navs(navs), args.repeat)
+
+    np.testing.assert_allclose(table["sharpe"], pandas_sharpe.sort_index(), rtol=1e-8)
+    np.testing.assert_allclose(table["cumulative_return"], pandas_cumulative, rtol=1e-8)
+
+    print(f"{args.rows} rows x {args.columns} columns")
+    print(f"pandas chain : {pandas_time * 1000:9.1f} ms")
+    print(f"fused kernel : {fused_time * 1000:9.1f} ms")
+    print(f"speedup      : {pandas_time / fused_time:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare peak RSS of the notebook's pandas pipeline with lean_report (Linux only).
+
+Each mode runs in a fresh interpreter that loads the same synthetic NAV panel,
+resets the kernel's peak-RSS counter (Linux ``/proc/self/clear_refs``) and then
+runs the pipeline, so the reported peak covers the pipeline itself.
+
+Usage: python benchmarks/bench_lowmem.py --rows 5040 --funds 2000
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_return.lowmem import lean_report  # noqa: E402
+from risk_return.synthetic import generate_navs  # noqa: E402
+
+MODES = ("pandas", "lean-float64", "lean-float32")
+
+
+def pandas_pipeline(navs):
+    # The frames the notebook keeps alive at the same time
+    daily_returns = navs.pct_change().dropna()
+    cumulative = (1 + daily_returns).cumprod()
+    fund_only = daily_returns.drop(columns="S&P 500")
+    std = daily_returns.std()
+    sharpe = (daily_returns.mean() * 252) / (daily_returns.std() * np.sqrt(252))
+    whale_rolling_std = daily_returns.rolling(window=21).std()
+    fund_rolling_std = fund_only.rolling(window=21).std()
+    variance = daily_returns["S&P 500"].rolling(window=60).var()
+    covariance = fund_only.rolling(window=60).cov(daily_returns["S&P 500"])
+    beta = covariance.div(variance, axis=0)
+    return cumulative, std, sharpe, whale_rolling_std, fund_rolling_std, beta
+
+
+def _rss_kib(field):
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+def run_mode(mode, npy_path, columns_path):
+    columns = Path(columns_path).read_text().splitlines()
+    navs = pd.DataFrame(np.load(npy_path), columns=columns)
+    # Writing "5" resets VmHWM (peak RSS) to the current RSS
+    with open("/proc/self/clear_refs", "w") as handle:
+        handle.write("5")
+    baseline = _rss_kib("VmRSS")
+    if mode == "pandas":
+        result = pandas_pipeline(navs)
+    else:
+        result = lean_report(navs, dtype=np.float32 if mode.endswith("32") else np.float64)
+    peak = _rss_kib("VmHWM")
+    del result
+    print(f"{baseline / 1024:.1f} {peak / 1024:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5040)
+    parser.add_argument("--funds", type=int, default=2000)
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--npy", help=argparse.SUPPRESS)
+    parser.add_argument("--columns-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode, args.npy, args.columns_file)
+        return
+
+    navs = generate_navs(args.rows, args.funds)
+    with tempfile.TemporaryDirectory() as tmp:
+        npy_path = Path(tmp) / "navs.npy"
+        columns_path = Path(tmp) / "columns.txt"
+        np.save(npy_path, navs.to_numpy())
+        columns_path.write_text("\n".join(navs.columns))
+        del navs
+
+        print(f"{args.rows} rows x {args.funds} funds + benchmark")
+        print(f"{'mode':<14} {'start MB':>10} {'peak MB':>10} {'growth MB':>10}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--run-mode", mode, "--npy", str(npy_path),
+                 "--columns-file", str(columns_path)],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()
+            start, peak = float(output[0]), float(output[1])
+            print(f"{mode:<14} {start:10.1f} {peak:10.1f} {peak - start:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
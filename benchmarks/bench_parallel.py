@@ -0,0 +1,36 @@
+"""Time parallel_report on a synthetic NAV panel across worker counts.
+
+Usage: python benchmarks/bench_parallel.py --rows 2520 --columns 4000 --workers 1 2 4 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_return.parallel import parallel_report  # noqa: E402
+from risk_return.synthetic import generate_navs  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2520)
+    parser.add_argument("--columns", type=int, default=4000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    navs = generate_navs(args.rows, args.columns - 1)
+
+    print(f"{args.rows} rows x {args.columns} columns")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        parallel_report(navs, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"workers={workers:3d} : {elapsed * 1000:9.1f} ms  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
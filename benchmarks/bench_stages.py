@@ -0,0 +1,123 @@
+"""Time each stage of the risk analysis on a synthetic NAV panel.
+
+Each stage runs once with the notebook's pandas calls and once with the
+risk_return engine, reporting wall time, throughput in cells (rows x columns
+of the stage's own input) per second and peak traced allocation. NaNs in the
+NAVs drop whole dates from the returns, so later stages see fewer rows.
+
+Usage: python benchmarks/bench_stages.py --rows 2520 --funds 2000 --nan-density 0 [--json out.json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import risk_return  # noqa: E402
+from risk_return.synthetic import generate_navs, write_navs_csv  # noqa: E402
+
+
+def measure(func):
+    """Run ``func`` untraced for timing, then again under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_stages(csv_path):
+    """Yield ``(stage, implementation, seconds, peak_bytes, cells)`` for every stage."""
+    navs, elapsed, peak = measure(lambda: risk_return.load_navs(csv_path))
+    cells = navs.size
+    yield "csv load", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: list(risk_return.iter_nav_chunks(csv_path)))
+    yield "csv load", "chunked", elapsed, peak, cells
+
+    # fill_method=None so both sides do the same work (pandas 1.5 forward-fills by default)
+    returns, elapsed, peak = measure(lambda: navs.pct_change(fill_method=None).dropna())
+    yield "pct_change", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: risk_return.compute_daily_returns(navs.to_numpy()))
+    yield "pct_change", "engine", elapsed, peak, cells
+
+    cells = returns.size
+
+    _, elapsed, peak = measure(lambda: (1 + returns).cumprod())
+    yield "cumprod", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: np.cumprod(1.0 + returns.to_numpy(), axis=0))
+    yield "cumprod", "engine", elapsed, peak, cells
+
+    def pandas_sharpe():
+        std = returns.std()
+        return std * np.sqrt(252), (returns.mean() * 252) / (returns.std() * np.sqrt(252))
+
+    _, elapsed, peak = measure(pandas_sharpe)
+    yield "std/sharpe", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: risk_return.fused_summary(returns))
+    yield "std/sharpe", "engine", elapsed, peak, cells
+
+    _, elapsed, peak = measure(lambda: returns.rolling(window=21).std())
+    yield "rolling std 21", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: risk_return.rolling_std_multi(returns.to_numpy(), (21,)))
+    yield "rolling std 21", "engine", elapsed, peak, cells
+
+    benchmark = returns[risk_return.BENCHMARK]
+    funds = returns.drop(columns=risk_return.BENCHMARK)
+    cells = funds.size
+
+    def pandas_beta():
+        covariance = funds.rolling(window=60).cov(benchmark)
+        return covariance.div(benchmark.rolling(window=60).var(), axis=0)
+
+    _, elapsed, peak = measure(pandas_beta)
+    yield "rolling beta 60", "pandas", elapsed, peak, cells
+    _, elapsed, peak = measure(lambda: risk_return.rolling_beta_multi(funds.to_numpy(), benchmark.to_numpy(), (60,)))
+    yield "rolling beta 60", "engine", elapsed, peak, cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2520)
+    parser.add_argument("--funds", type=int, default=2000)
+    parser.add_argument("--nan-density", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    navs = generate_navs(args.rows, args.funds, args.nan_density, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_navs_csv(navs, Path(tmp) / "navs.csv")
+        del navs
+        results = [
+            {
+                "stage": stage,
+                "implementation": implementation,
+                "seconds": seconds,
+                "cells_per_second": cells / seconds if seconds else None,
+                "peak_mb": peak / 2 ** 20,
+            }
+            for stage, implementation, seconds, peak, cells in run_stages(csv_path)
+        ]
+
+    print(f"{args.rows} rows x {args.funds} funds + benchmark, NaN density {args.nan_density}")
+    print(f"{'stage':<16} {'impl':<8} {'ms':>10} {'Mcells/s':>10} {'peak MB':>10}")
+    for row in results:
+        print(
+            f"{row['stage']:<16} {row['implementation']:<8} {row['seconds'] * 1000:10.1f} "
+            f"{row['cells_per_second'] / 1e6:10.1f} {row['peak_mb']:10.1f}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
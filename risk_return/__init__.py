@@ -0,0 +1,124 @@
+"""Headless risk/return metrics for NAV panels."""
+from .cache import build_cache, load_navs_cached, open_nav_cache
+from .cli import build_report, write_report
+from .data import DEFAULT_NAV_PATH, NavChunk, iter_nav_chunks, load_navs, read_nav_columns
+from .fused import RunningMoments, fused_summary, fused_summary_from_navs
+from .graph import ResultCache, RiskGraph, shared_cache
+from .lowmem import LeanReport, lean_report
+from .masked import (
+    masked_cumulative_returns,
+    masked_daily_returns,
+    masked_rolling_beta,
+    masked_rolling_std,
+    masked_summary,
+)
+from .metrics import (
+    BENCHMARK,
+    TRADING_DAYS,
+    annualized_average_returns,
+    annualized_sharpe,
+    annualized_sortino,
+    annualized_std,
+    compute_cumulative_returns,
+    compute_daily_returns,
+    daily_std,
+    drawdowns,
+    historical_cvar,
+    historical_var,
+    max_drawdown,
+    parametric_cvar,
+    parametric_var,
+    rolling_beta,
+    rolling_covariance,
+    rolling_historical_cvar,
+    rolling_historical_var,
+    rolling_max_drawdown,
+    rolling_sortino,
+    rolling_std,
+    rolling_variance,
+    tail_risk,
+)
+from .outofcore import navs_to_returns_memmap, rolling_beta_memmap, rolling_std_memmap
+from .parallel import parallel_report
+from .profiling import NULL_PROFILER, Profiler
+from .ranges import PrefixIndex, RangeStats
+from .resample import PERIODS_PER_YEAR, frequency_summary, period_starts, periods_per_year, resample_returns
+from .rolling import DEFAULT_WINDOWS, Exposures, rolling_beta_multi, rolling_exposures, rolling_std_multi
+from .state import DayMetrics, RiskState
+from .stream import ChunkMetrics, StreamingRiskEngine, stream_metrics
+from .synthetic import generate_navs, write_navs_csv
+
+__all__ = [
+    "BENCHMARK",
+    "ChunkMetrics",
+    "DEFAULT_NAV_PATH",
+    "DEFAULT_WINDOWS",
+    "DayMetrics",
+    "Exposures",
+    "LeanReport",
+    "NULL_PROFILER",
+    "NavChunk",
+    "PERIODS_PER_YEAR",
+    "PrefixIndex",
+    "Profiler",
+    "RangeStats",
+    "ResultCache",
+    "RiskGraph",
+    "RiskState",
+    "RunningMoments",
+    "StreamingRiskEngine",
+    "TRADING_DAYS",
+    "annualized_average_returns",
+    "annualized_sharpe",
+    "annualized_sortino",
+    "annualized_std",
+    "build_cache",
+    "build_report",
+    "compute_cumulative_returns",
+    "compute_daily_returns",
+    "daily_std",
+    "drawdowns",
+    "frequency_summary",
+    "fused_summary",
+    "fused_summary_from_navs",
+    "generate_navs",
+    "historical_cvar",
+    "historical_var",
+    "iter_nav_chunks",
+    "lean_report",
+    "load_navs",
+    "load_navs_cached",
+    "masked_cumulative_returns",
+    "masked_daily_returns",
+    "masked_rolling_beta",
+    "masked_rolling_std",
+    "masked_summary",
+    "max_drawdown",
+    "navs_to_returns_memmap",
+    "open_nav_cache",
+    "parallel_report",
+    "parametric_cvar",
+    "parametric_var",
+    "period_starts",
+    "periods_per_year",
+    "read_nav_columns",
+    "resample_returns",
+    "rolling_beta",
+    "rolling_beta_memmap",
+    "rolling_beta_multi",
+    "rolling_covariance",
+    "rolling_exposures",
+    "rolling_historical_cvar",
+    "rolling_historical_var",
+    "rolling_max_drawdown",
+    "rolling_sortino",
+    "rolling_std",
+    "rolling_std_memmap",
+    "rolling_std_multi",
+    "rolling_variance",
+    "shared_cache",
+    "stream_metrics",
+    "tail_risk",
+    "write_navs_csv",
+    "write_report",
+]
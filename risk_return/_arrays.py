@@ -0,0 +1,41 @@
+"""Conversions between the package's pandas/NumPy inputs and 2-D float64 arrays.
+
+The vectorized kernels work on a (rows x columns) array; these helpers take
+the labels off a DataFrame, Series or array and put them back on the result,
+so a Series or 1-D input gives a Series or 1-D (or scalar) result again.
+"""
+import numpy as np
+import pandas as pd
+
+
+def as_matrix(data):
+    """Return ``(values, index, columns)`` with ``values`` a 2-D float64 array.
+
+    ``index`` and ``columns`` are ``None`` for NumPy input; a Series becomes a
+    single column named after it.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=np.float64), data.index, data.columns
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=np.float64)[:, np.newaxis], data.index, pd.Index([data.name])
+    values = np.asarray(data, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    return values, None, None
+
+
+def wrap_rows(result, index, columns, squeeze):
+    """Label a row-wise (rows x columns) result like the input; ``squeeze`` for 1-D inputs."""
+    if index is None:
+        return result[:, 0] if squeeze else result
+    frame = pd.DataFrame(result, index=index, columns=columns)
+    return frame.iloc[:, 0] if squeeze else frame
+
+
+def wrap_columns(result, columns, squeeze):
+    """Label a per-column result like the input; a 1-D input gives a scalar."""
+    if squeeze:
+        return result[0]
+    if columns is None:
+        return result
+    return pd.Series(result, index=columns)
@@ -0,0 +1,150 @@
+"""Binary cache of parsed NAV files.
+
+The first load of ``navs.csv`` writes a ``navs.csv.npcache`` directory next to
+it holding the dates as int64 nanoseconds and the values as one column-major
+(Fortran order) ``.npy`` array per dtype, so each fund's history is contiguous
+on disk. Later loads memory-map those arrays instead of parsing text. The
+cache is keyed on the csv's size and modification time (and optionally its
+SHA-256); any change rebuilds it. While building, parsed chunks are appended
+to row-major staging files, so the cache holds exactly the rows pandas parses
+(blank lines are skipped) rather than a size guessed from counting lines.
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import DATE_COLUMN, DEFAULT_CHUNK_ROWS, DEFAULT_NAV_PATH, iter_nav_chunks, read_nav_columns
+
+CACHE_SUFFIX = ".npcache"
+META_FILE = "meta.json"
+DATES_FILE = "dates.npy"
+
+# Row-major scratch files written while the csv is parsed
+STAGED_VALUES_FILE = "values.staged"
+STAGED_DATES_FILE = "dates.staged"
+
+
+def cache_dir_for(path):
+    """Cache directory used for the NAV csv at ``path``."""
+    path = Path(path)
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def _values_file(dtype):
+    return f"values-{np.dtype(dtype).name}.npy"
+
+
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _signature(path, with_hash):
+    stat = os.stat(path)
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        signature["sha256"] = _file_hash(path)
+    return signature
+
+
+def _spool_chunks(path, tmp_dir, dtype, chunk_rows):
+    """Append each parsed chunk to row-major staging files; returns the number of rows."""
+    n_rows = 0
+    with open(tmp_dir / STAGED_VALUES_FILE, "wb") as values, open(tmp_dir / STAGED_DATES_FILE, "wb") as dates:
+        for chunk in iter_nav_chunks(path, chunk_rows, dtype):
+            np.ascontiguousarray(chunk.values, dtype=dtype).tofile(values)
+            chunk.dates.astype("datetime64[ns]").view(np.int64).tofile(dates)
+            n_rows += chunk.values.shape[0]
+    return n_rows
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(cache_dir / META_FILE) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(meta, signature):
+    if meta is None:
+        return False
+    return all(meta["source"].get(key) == value for key, value in signature.items())
+
+
+def build_cache(path=DEFAULT_NAV_PATH, dtype=np.float64, chunk_rows=DEFAULT_CHUNK_ROWS, verify_hash=False):
+    """Parse the csv once in chunks and write its binary cache; returns the cache directory."""
+    path = Path(path)
+    cache_dir = cache_dir_for(path)
+    signature = _signature(path, verify_hash)
+    meta = _read_meta(cache_dir)
+    if not _is_fresh(meta, signature):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        meta = None
+
+    columns = read_nav_columns(path)
+    tmp_dir = cache_dir.with_name(cache_dir.name + f".tmp{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+    n_rows = _spool_chunks(path, tmp_dir, dtype, chunk_rows)
+    staged_path = tmp_dir / STAGED_VALUES_FILE
+    # Copy in row blocks so only one block of the staged rows is resident
+    values = np.lib.format.open_memmap(
+        tmp_dir / _values_file(dtype), mode="w+", dtype=dtype, shape=(n_rows, len(columns)), fortran_order=True,
+    )
+    if n_rows:
+        staged = np.memmap(staged_path, dtype=dtype, mode="r", shape=(n_rows, len(columns)))
+        for start in range(0, n_rows, chunk_rows):
+            values[start:start + chunk_rows] = staged[start:start + chunk_rows]
+        del staged
+    values.flush()
+    del values
+    staged_path.unlink()
+    dates_path = tmp_dir / STAGED_DATES_FILE
+    np.save(tmp_dir / DATES_FILE, np.fromfile(dates_path, dtype=np.int64))
+    dates_path.unlink()
+
+    cache_dir.mkdir(exist_ok=True)
+    for item in tmp_dir.iterdir():
+        os.replace(item, cache_dir / item.name)
+    tmp_dir.rmdir()
+    meta = {"source": signature, "columns": columns, "rows": n_rows}
+    with open(cache_dir / META_FILE, "w") as handle:
+        json.dump(meta, handle)
+    return cache_dir
+
+
+def open_nav_cache(path=DEFAULT_NAV_PATH, dtype=np.float64, verify_hash=False):
+    """Return ``(dates, values, columns)`` memory-mapped from the cache, building it if stale.
+
+    ``dates`` is int64 nanoseconds since the epoch and ``values`` a read-only
+    ``(rows, columns)`` memmap in Fortran order.
+    """
+    path = Path(path)
+    cache_dir = cache_dir_for(path)
+    meta = _read_meta(cache_dir)
+    values_path = cache_dir / _values_file(dtype)
+    if not _is_fresh(meta, _signature(path, verify_hash)) or not values_path.exists():
+        build_cache(path, dtype, verify_hash=verify_hash)
+        meta = _read_meta(cache_dir)
+    dates = np.load(cache_dir / DATES_FILE, mmap_mode="r")
+    values = np.load(values_path, mmap_mode="r")
+    return dates, values, meta["columns"]
+
+
+def load_navs_cached(path=DEFAULT_NAV_PATH, dtype=np.float64, verify_hash=False):
+    """Cached drop-in for :func:`risk_return.data.load_navs`.
+
+    The DataFrame wraps the memory-mapped values without copying them.
+    """
+    dates, values, columns = open_nav_cache(path, dtype, verify_hash)
+    index = pd.DatetimeIndex(np.asarray(dates).view("datetime64[ns]"), name=DATE_COLUMN)
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
@@ -0,0 +1,175 @@
+"""Command-line risk report.
+
+Usage: python -m risk_return Resources/whale_navs.csv --output-dir report [--format json] [--plot]
+
+Computes every metric from the notebook and writes them as csv (one file per
+table) or a single JSON document. Plotting is off by default; ``--plot``
+imports matplotlib and saves the figures as PNGs.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from .data import load_navs
+from .fused import fused_summary
+from .metrics import BENCHMARK, TRADING_DAYS, compute_cumulative_returns, compute_daily_returns, tail_risk
+from .profiling import NULL_PROFILER, Profiler
+from .resample import PERIODS_PER_YEAR, frequency_summary, resample_returns
+from .rolling import rolling_beta_multi, rolling_std_multi
+
+
+def build_report(navs, benchmark=BENCHMARK, std_windows=(21,), beta_windows=(60,), trading_days=TRADING_DAYS,
+                 frequencies=(), profiler=NULL_PROFILER):
+    """All metrics for a NAV DataFrame as a dict of pandas objects.
+
+    ``rolling_std`` and ``rolling_beta`` map each window to a DataFrame;
+    ``average_beta`` holds the mean rolling beta per fund and window.
+    ``period_returns`` and ``period_summary`` map each of ``frequencies``
+    (``"W"``, ``"M"``, ``"Q"``) to the compounded returns and their summary.
+    Each stage is timed by ``profiler`` (see :mod:`risk_return.profiling`).
+    """
+    rows = len(navs)
+    with profiler.stage("pct_change", rows):
+        daily_returns = compute_daily_returns(navs)
+    with profiler.stage("cumprod", rows):
+        cumulative_returns = compute_cumulative_returns(daily_returns)
+    with profiler.stage("summary", rows):
+        summary = fused_summary(daily_returns, trading_days)
+    with profiler.stage("tail_risk", rows):
+        tail = tail_risk(daily_returns, trading_days=trading_days)
+    with profiler.stage("rolling_std", rows):
+        rolling_std = rolling_std_multi(daily_returns, std_windows)
+    with profiler.stage("rolling_beta", rows):
+        fund_only = daily_returns.drop(columns=benchmark)
+        rolling_beta = rolling_beta_multi(fund_only, daily_returns[benchmark], beta_windows)
+        average_beta = {window: beta.mean() for window, beta in rolling_beta.items()}
+    with profiler.stage("resample", rows):
+        period_returns = {freq: resample_returns(daily_returns, freq) for freq in frequencies}
+        period_summary = frequency_summary(daily_returns, benchmark, frequencies, trading_days)
+    return {
+        "daily_returns": daily_returns,
+        "cumulative_returns": cumulative_returns,
+        "summary": summary,
+        "tail_risk": tail,
+        "rolling_std": rolling_std,
+        "rolling_beta": rolling_beta,
+        "average_beta": average_beta,
+        "period_returns": period_returns,
+        "period_summary": period_summary,
+    }
+
+
+def _frames(report):
+    """Flatten the report into ``{name: DataFrame}`` for writing."""
+    frames = {
+        "daily_returns": report["daily_returns"],
+        "cumulative_returns": report["cumulative_returns"],
+        "summary": report["summary"],
+        "tail_risk": report["tail_risk"],
+    }
+    for window, frame in report["rolling_std"].items():
+        frames[f"rolling_std_{window}"] = frame
+    for window, frame in report["rolling_beta"].items():
+        frames[f"rolling_beta_{window}"] = frame
+    frames["average_beta"] = pd.DataFrame(
+        {f"beta_{window}": beta for window, beta in report["average_beta"].items()}
+    )
+    for freq, frame in report.get("period_returns", {}).items():
+        frames[f"returns_{freq}"] = frame
+    for freq, frame in report.get("period_summary", {}).items():
+        frames[f"summary_{freq}"] = frame
+    return frames
+
+
+def write_report(report, output_dir, output_format="csv"):
+    """Write the report tables to ``output_dir``; returns the written paths."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    frames = _frames(report)
+    if output_format == "json":
+        path = output_dir / "report.json"
+        document = {
+            name: json.loads(frame.to_json(orient="split", date_format="iso"))
+            for name, frame in frames.items()
+        }
+        path.write_text(json.dumps(document))
+        return [path]
+    paths = []
+    for name, frame in frames.items():
+        path = output_dir / f"{name}.csv"
+        frame.to_csv(path)
+        paths.append(path)
+    return paths
+
+
+def _windows(text):
+    windows = tuple(int(window) for window in text.split(","))
+    short = [str(window) for window in windows if window < 2]
+    if short:
+        raise argparse.ArgumentTypeError(f"rolling windows must be at least 2, got {', '.join(short)}")
+    return windows
+
+
+def _frequencies(text):
+    frequencies = tuple(freq.strip().upper() for freq in text.split(",") if freq.strip())
+    unknown = [freq for freq in frequencies if freq not in PERIODS_PER_YEAR]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unsupported frequency {', '.join(unknown)}; expected {', '.join(PERIODS_PER_YEAR)}"
+        )
+    return frequencies
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m risk_return", description="Headless NAV risk report.")
+    parser.add_argument("navs", type=Path, help="NAV csv with a 'date' column")
+    parser.add_argument("--output-dir", type=Path, default=Path("risk_report"))
+    parser.add_argument("--format", choices=("csv", "json"), default="csv", dest="output_format")
+    parser.add_argument("--benchmark", default=BENCHMARK, help="benchmark column (default: %(default)s)")
+    parser.add_argument("--std-windows", type=_windows, default=(21,), help="comma separated, e.g. 21,63")
+    parser.add_argument("--beta-windows", type=_windows, default=(60,), help="comma separated, e.g. 21,60,252")
+    parser.add_argument("--trading-days", type=int, default=TRADING_DAYS)
+    parser.add_argument(
+        "--frequencies", type=_frequencies, default=(), help="also report compounded returns, e.g. W,M,Q",
+    )
+    parser.add_argument("--plot", action="store_true", help="also save PNG figures (requires matplotlib)")
+    parser.add_argument("--profile", type=Path, metavar="JSON", help="write per-stage timings to this file")
+    parser.add_argument("--trace-memory", action="store_true", help="with --profile, record bytes allocated per stage")
+    parser.add_argument(
+        "--cprofile", action="store_true", help="with --profile, record the hottest functions per stage",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = NULL_PROFILER
+    if args.profile:
+        profiler = Profiler(trace_memory=args.trace_memory, cprofile=args.cprofile)
+    with profiler.stage("csv_load"):
+        navs = load_navs(args.navs)
+    if args.benchmark not in navs.columns:
+        print(f"error: benchmark column {args.benchmark!r} not in {args.navs}", file=sys.stderr)
+        return 2
+    report = build_report(
+        navs, args.benchmark, args.std_windows, args.beta_windows, args.trading_days, args.frequencies, profiler,
+    )
+    with profiler.stage("write_report"):
+        paths = write_report(report, args.output_dir, args.output_format)
+    if args.plot:
+        try:
+            from .plots import save_figures
+
+            paths += save_figures(report, args.output_dir, args.benchmark)
+        except ImportError as error:
+            print(f"error: --plot requires matplotlib ({error})", file=sys.stderr)
+            return 2
+    if args.profile:
+        profiler.to_json(args.profile)
+        paths.append(args.profile)
+    for path in paths:
+        print(path)
+    return 0
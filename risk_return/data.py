@@ -0,0 +1,56 @@
+"""Loading NAV panels from disk."""
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Default location of the sample NAV data shipped with the repo
+DEFAULT_NAV_PATH = Path(__file__).resolve().parent.parent / "Resources" / "whale_navs.csv"
+
+# Name and format of the date column in NAV files
+DATE_COLUMN = "date"
+DATE_FORMAT = "%Y-%m-%d"
+
+# Rows per chunk when streaming a NAV file
+DEFAULT_CHUNK_ROWS = 100_000
+
+# One block of a streamed NAV file: datetime64[ns] dates and a 2-D value array
+NavChunk = namedtuple("NavChunk", ["dates", "values"])
+
+
+def _parse_dates(dates):
+    return pd.to_datetime(dates, format=DATE_FORMAT)
+
+
+def load_navs(path=DEFAULT_NAV_PATH):
+    """Read a NAV csv into a DataFrame with a DatetimeIndex named ``date``."""
+    navs = pd.read_csv(Path(path), index_col=DATE_COLUMN)
+    navs.index = _parse_dates(navs.index)
+    navs.index.name = DATE_COLUMN
+    return navs
+
+
+def read_nav_columns(path=DEFAULT_NAV_PATH):
+    """Names of the value columns of a NAV csv, in file order."""
+    header = pd.read_csv(Path(path), nrows=0)
+    return [column for column in header.columns if column != DATE_COLUMN]
+
+
+def iter_nav_chunks(path=DEFAULT_NAV_PATH, chunk_rows=DEFAULT_CHUNK_ROWS, dtype=np.float64):
+    """Yield :class:`NavChunk` blocks of at most ``chunk_rows`` rows.
+
+    Only one chunk is held in memory at a time. Value columns are parsed
+    straight into ``dtype`` (float32 halves the footprint) and the date column
+    is parsed with the fixed ISO format rather than inferred.
+    """
+    columns = read_nav_columns(path)
+    reader = pd.read_csv(
+        Path(path),
+        chunksize=chunk_rows,
+        dtype={column: dtype for column in columns},
+    )
+    with reader:
+        for frame in reader:
+            dates = _parse_dates(frame.pop(DATE_COLUMN)).to_numpy()
+            yield NavChunk(dates, frame[columns].to_numpy(dtype=dtype))
@@ -0,0 +1,95 @@
+"""Single-pass summary statistics over a returns matrix.
+
+The notebook walks the daily returns several times (``std`` twice, ``mean``,
+``pct_change`` and ``cumprod``). Here the matrix is swept once in row blocks:
+each block's count, mean, sum of squared deviations and growth product are
+merged into running per-column totals with Chan et al.'s parallel form of
+Welford's update, so the whole summary costs one read of the data.
+"""
+import numpy as np
+import pandas as pd
+
+from ._arrays import as_matrix
+from .metrics import TRADING_DAYS
+
+# Rows per block; 1024 rows x 10k float64 columns is ~80MB of scratch
+DEFAULT_BLOCK_ROWS = 1024
+
+
+class RunningMoments:
+    """Per-column running count, mean, M2 and cumulative growth."""
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean = np.zeros(n_columns, dtype=np.float64)
+        self.m2 = np.zeros(n_columns, dtype=np.float64)
+        self.growth = np.ones(n_columns, dtype=np.float64)
+
+    def update(self, block):
+        """Merge a 2-D block of returns (rows x columns) into the totals."""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        n_block = block.shape[0]
+        if n_block == 0:
+            return self
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+        total = self.count + n_block
+        delta = block_mean - self.mean
+        self.mean += delta * (n_block / total)
+        self.m2 += block_m2 + delta ** 2 * (self.count * n_block / total)
+        self.growth *= np.prod(1.0 + block, axis=0)
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), NaN with fewer than two rows."""
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return self.m2 / (self.count - 1)
+
+    def table(self, columns=None, trading_days=TRADING_DAYS):
+        """Compact per-column result table."""
+        variance = self.variance
+        std = np.sqrt(variance)
+        annualized_std = std * np.sqrt(trading_days)
+        annualized_return = self.mean * trading_days
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = annualized_return / annualized_std
+        return pd.DataFrame(
+            {
+                "mean": self.mean,
+                "variance": variance,
+                "annualized_std": annualized_std,
+                "annualized_return": annualized_return,
+                "sharpe": sharpe,
+                "cumulative_return": self.growth,
+            },
+            index=columns,
+        )
+
+
+def fused_summary(daily_returns, trading_days=TRADING_DAYS, block_rows=DEFAULT_BLOCK_ROWS):
+    """Mean, variance, annualized std/return, Sharpe and final cumulative return in one pass.
+
+    ``daily_returns`` must not contain NaNs (i.e. the ``pct_change().dropna()``
+    output). Returns a DataFrame indexed by column.
+    """
+    values, _, columns = as_matrix(daily_returns)
+    moments = RunningMoments(values.shape[1])
+    for start in range(0, values.shape[0], block_rows):
+        moments.update(values[start:start + block_rows])
+    return moments.table(columns, trading_days)
+
+
+def fused_summary_from_navs(navs, trading_days=TRADING_DAYS, block_rows=DEFAULT_BLOCK_ROWS):
+    """Like :func:`fused_summary` but starting from NAVs, fusing ``pct_change`` into the sweep."""
+    values, _, columns = as_matrix(navs)
+    moments = RunningMoments(values.shape[1])
+    # Each block overlaps the previous one by a row so returns span the boundary
+    for start in range(0, max(values.shape[0] - 1, 0), block_rows):
+        block = values[start:start + block_rows + 1]
+        moments.update(block[1:] / block[:-1] - 1.0)
+    return moments.table(columns, trading_days)
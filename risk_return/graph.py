@@ -0,0 +1,237 @@
+"""Memoized graph of the derived series, for running many report variants.
+
+The analysis is a small DAG::
+
+    navs -> daily returns -> cumulative returns
+                          -> std -> annualized std -> Sharpe
+                          -> mean ----------------------^
+                          -> rolling std
+                          -> benchmark rolling var --> rolling beta
+                          -> rolling cov with benchmark --^
+
+:class:`RiskGraph` evaluates these nodes lazily, per column where the node is
+per column, and stores every result in a :class:`ResultCache` keyed by the
+content hash of the NAV panel plus the node's parameters. A variant only
+computes the nodes whose inputs changed: switching the fund pair reuses the
+daily returns and the benchmark's rolling variance, and changing the trading
+day constant reuses every std. The cache is an LRU bounded by bytes, shared by
+default across graphs so rebuilding a graph over the same data hits it too.
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .metrics import BENCHMARK, TRADING_DAYS, compute_cumulative_returns, compute_daily_returns
+
+# Default memory bound of the shared cache
+DEFAULT_CACHE_BYTES = 512 * 2 ** 20
+
+
+def _nbytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU mapping of node keys to results, bounded by total bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        # Results larger than the whole budget are returned but not kept
+        if size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_shared_cache = ResultCache()
+
+
+def shared_cache():
+    """The process-wide cache used when a graph is built without one."""
+    return _shared_cache
+
+
+def fingerprint(navs):
+    """Content hash of a NAV DataFrame: values, dates and column names."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(navs.to_numpy(dtype=np.float64)).tobytes())
+    digest.update(pd.util.hash_pandas_object(navs.index).to_numpy().tobytes())
+    digest.update(repr(list(navs.columns)).encode())
+    return digest.hexdigest()
+
+
+class RiskGraph:
+    """Lazy, memoized evaluation of the analysis for one NAV panel.
+
+    Returned objects may be held by the cache; treat them as read-only.
+    """
+
+    def __init__(self, navs, benchmark=BENCHMARK, cache=None):
+        self.navs = navs
+        self.benchmark = benchmark
+        self.cache = shared_cache() if cache is None else cache
+        self.key = fingerprint(navs)
+
+    def _node(self, name, compute, *params):
+        return self.cache.get_or_compute((self.key, name) + params, compute)
+
+    @staticmethod
+    def _columns(columns, available):
+        return list(available) if columns is None else list(columns)
+
+    def _returns_getter(self):
+        """Fetch the daily returns at most once per public call.
+
+        Per-column nodes share this getter, so a returns panel too large for
+        the cache is computed once per call rather than once per column.
+        """
+        fetched = []
+
+        def get():
+            if not fetched:
+                fetched.append(self.daily_returns())
+            return fetched[0]
+
+        return get
+
+    # Panel-wide nodes
+
+    def daily_returns(self):
+        return self._node("daily_returns", lambda: compute_daily_returns(self.navs))
+
+    def cumulative_returns(self):
+        return self._node("cumulative_returns", lambda: compute_cumulative_returns(self.daily_returns()))
+
+    # Per-column nodes, assembled into a Series/DataFrame for the requested columns
+
+    def _column_std(self, column, returns):
+        return self._node("std", lambda: returns()[column].std(), column)
+
+    def _column_mean(self, column, returns):
+        return self._node("mean", lambda: returns()[column].mean(), column)
+
+    def std(self, columns=None):
+        columns = self._columns(columns, self.navs.columns)
+        returns = self._returns_getter()
+        return pd.Series([self._column_std(column, returns) for column in columns], index=columns)
+
+    def annualized_std(self, columns=None, trading_days=TRADING_DAYS):
+        return self._annualized_std(self._columns(columns, self.navs.columns), trading_days, self._returns_getter())
+
+    def _annualized_std(self, columns, trading_days, returns):
+        values = [
+            self._node("annualized_std", lambda c=column: self._column_std(c, returns) * np.sqrt(trading_days),
+                       column, trading_days)
+            for column in columns
+        ]
+        return pd.Series(values, index=columns)
+
+    def sharpe(self, columns=None, trading_days=TRADING_DAYS):
+        columns = self._columns(columns, self.navs.columns)
+        returns = self._returns_getter()
+        annualized_std = self._annualized_std(columns, trading_days, returns)
+        values = [
+            self._node(
+                "sharpe",
+                lambda c=column: self._column_mean(c, returns) * trading_days / annualized_std[c],
+                column, trading_days,
+            )
+            for column in columns
+        ]
+        return pd.Series(values, index=columns)
+
+    def rolling_std(self, columns=None, window=21):
+        columns = self._columns(columns, self.navs.columns)
+        returns = self._returns_getter()
+        return pd.concat(
+            {
+                column: self._node(
+                    "rolling_std", lambda c=column: returns()[c].rolling(window=window).std(),
+                    column, window,
+                )
+                for column in columns
+            },
+            axis=1,
+        )
+
+    def benchmark_variance(self, window=60):
+        return self._node(
+            "benchmark_variance",
+            lambda: self.daily_returns()[self.benchmark].rolling(window=window).var(),
+            self.benchmark, window,
+        )
+
+    def rolling_covariance(self, columns, window=60):
+        returns = self._returns_getter()
+        return pd.concat(
+            {
+                column: self._node(
+                    "rolling_covariance",
+                    lambda c=column: returns()[c].rolling(window=window).cov(returns()[self.benchmark]),
+                    column, self.benchmark, window,
+                )
+                for column in columns
+            },
+            axis=1,
+        )
+
+    def rolling_beta(self, columns, window=60):
+        variance = self.benchmark_variance(window)
+        covariance = self.rolling_covariance(columns, window)
+        return pd.concat(
+            {
+                column: self._node(
+                    "rolling_beta", lambda c=column: covariance[c] / variance,
+                    column, self.benchmark, window,
+                )
+                for column in columns
+            },
+            axis=1,
+        )
@@ -0,0 +1,128 @@
+"""NaN-aware metrics for ragged NAV panels.
+
+``pct_change().dropna()`` drops a date when any one fund is missing, so a
+universe of funds with different inception dates loses most of its history.
+These functions keep the full date index and treat NaN as "no observation":
+each fund's statistics cover its own valid span, and rolling windows are
+computed from running sums of the values and of the observation counts, with
+``min_periods`` deciding how many observations a window needs. Everything is
+vectorized over the whole matrix.
+"""
+import numpy as np
+import pandas as pd
+
+from ._arrays import as_matrix, wrap_rows
+from .metrics import TRADING_DAYS
+from .rolling import prefix_sums, window_sums
+
+
+def _nan_centered(values):
+    # Shifting each column by its mean keeps the running sums small
+    with np.errstate(invalid="ignore"):
+        counts = (~np.isnan(values)).sum(axis=0)
+        center = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+    return values - center
+
+
+def masked_daily_returns(navs):
+    """Daily returns measured from each fund's previous valid NAV.
+
+    Dates before a fund's inception, and dates on which its NAV is missing,
+    are NaN. A return spanning a gap is booked on the next valid NAV, so the
+    compounded returns still reproduce the NAV path.
+    """
+    values, index, columns = as_matrix(navs)
+    previous = pd.DataFrame(values).ffill().to_numpy()
+    returns = np.full(values.shape, np.nan)
+    returns[1:] = values[1:] / previous[:-1] - 1.0
+    squeeze = np.ndim(navs) == 1
+    return wrap_rows(returns, index, columns, squeeze)
+
+
+def masked_cumulative_returns(daily_returns):
+    """Cumulative growth per fund, ignoring missing returns; NaN where the return is missing."""
+    values, index, columns = as_matrix(daily_returns)
+    growth = np.cumprod(np.where(np.isnan(values), 1.0, 1.0 + values), axis=0)
+    growth[np.isnan(values)] = np.nan
+    return wrap_rows(growth, index, columns, np.ndim(daily_returns) == 1)
+
+
+def masked_summary(daily_returns, trading_days=TRADING_DAYS, min_periods=2):
+    """Per-fund observations, mean, std, annualized std/return, Sharpe and cumulative return.
+
+    Each fund uses only its valid observations; funds with fewer than
+    ``min_periods`` get NaN statistics.
+    """
+    values, _, columns = as_matrix(daily_returns)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(values, axis=0) / count
+        deviations = np.where(valid, values - mean, 0.0)
+        variance = (deviations ** 2).sum(axis=0) / (count - 1)
+    enough = count >= max(min_periods, 2)
+    mean = np.where(count >= max(min_periods, 1), mean, np.nan)
+    variance = np.where(enough, variance, np.nan)
+    std = np.sqrt(variance)
+    annualized_std = std * np.sqrt(trading_days)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean * trading_days / annualized_std
+    cumulative = np.where(count > 0, np.prod(np.where(valid, 1.0 + values, 1.0), axis=0), np.nan)
+    return pd.DataFrame(
+        {
+            "observations": count,
+            "mean": mean,
+            "std": std,
+            "annualized_std": annualized_std,
+            "annualized_return": mean * trading_days,
+            "sharpe": sharpe,
+            "cumulative_return": cumulative,
+        },
+        index=columns,
+    )
+
+
+def masked_rolling_std(daily_returns, window=21, min_periods=None):
+    """Rolling std over the valid observations in each window.
+
+    Matches ``rolling(window, min_periods=min_periods).std()``;
+    ``min_periods`` defaults to ``window``.
+    """
+    min_periods = window if min_periods is None else max(min_periods, 2)
+    values, index, columns = as_matrix(daily_returns)
+    valid = ~np.isnan(values)
+    x = np.where(valid, _nan_centered(values), 0.0)
+    count = window_sums(prefix_sums(valid.astype(np.float64)), window, partial=True)
+    sx = window_sums(prefix_sums(x), window, partial=True)
+    sxx = window_sums(prefix_sums(x * x), window, partial=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.maximum(sxx - sx * sx / count, 0.0) / (count - 1)
+    variance[~(count >= min_periods)] = np.nan
+    return wrap_rows(np.sqrt(variance), index, columns, np.ndim(daily_returns) == 1)
+
+
+def masked_rolling_beta(daily_returns, benchmark_returns, window=60, min_periods=None):
+    """Rolling beta of each fund using only the dates where fund and benchmark are both observed.
+
+    The benchmark variance is taken over the same paired observations as
+    the covariance, so a fund's gaps do not bias its beta. Windows with fewer
+    than ``min_periods`` pairs (default ``window``) are NaN.
+    """
+    min_periods = window if min_periods is None else max(min_periods, 2)
+    values, index, columns = as_matrix(daily_returns)
+    benchmark = np.asarray(benchmark_returns, dtype=np.float64).reshape(-1)
+    if benchmark.shape[0] != values.shape[0]:
+        raise ValueError("benchmark_returns must have one value per row of daily_returns")
+    paired = ~np.isnan(values) & ~np.isnan(benchmark)[:, np.newaxis]
+    x = np.where(paired, _nan_centered(values), 0.0)
+    y = np.where(paired, _nan_centered(benchmark[:, np.newaxis]), 0.0)
+
+    count = window_sums(prefix_sums(paired.astype(np.float64)), window, partial=True)
+    sx = window_sums(prefix_sums(x), window, partial=True)
+    sy = window_sums(prefix_sums(y), window, partial=True)
+    sxy = window_sums(prefix_sums(x * y), window, partial=True)
+    syy = window_sums(prefix_sums(y * y), window, partial=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (sxy - sx * sy / count) / (syy - sy * sy / count)
+    beta[~(count >= min_periods)] = np.nan
+    return wrap_rows(beta, index, columns, np.ndim(daily_returns) == 1)
@@ -0,0 +1,294 @@
+"""Pure risk/return metric functions.
+
+Each function mirrors one step of ``risk_return_analysis.ipynb`` but has no
+plotting or IPython side effects. Inputs may be pandas objects (the result
+keeps the index and column labels) or NumPy arrays (the result is a NumPy
+array of the same dimensionality).
+"""
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from ._arrays import as_matrix, wrap_columns, wrap_rows
+
+# Number of trading days used to annualize daily statistics
+TRADING_DAYS = 252
+
+# Name of the benchmark column in whale_navs.csv
+BENCHMARK = "S&P 500"
+
+# Scratch budget for the window copies made by rolling VaR/CVaR
+DEFAULT_MAX_BLOCK_BYTES = 64 * 2 ** 20
+
+
+def _as_pandas(data):
+    """Return ``(pandas_obj, restore)`` where ``restore`` maps a pandas result back to the input type."""
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return data, lambda result: result
+    array = np.asarray(data, dtype=np.float64)
+    if array.ndim == 1:
+        return pd.Series(array), lambda result: np.asarray(result, dtype=np.float64)
+    return pd.DataFrame(array), lambda result: np.asarray(result, dtype=np.float64)
+
+
+def compute_daily_returns(navs, dropna=True):
+    """Daily percentage change of each NAV series.
+
+    Computed as ``pct_change(fill_method=None).dropna()``: a missing NAV is
+    not forward-filled, so it gives NaN returns on its own date and the next
+    one, and ``dropna`` removes both dates. The notebook's bare
+    ``pct_change()`` forward-fills first under the pinned pandas 1.5, which
+    keeps those dates (with a zero return over the gap); the two agree on
+    NAVs without gaps, such as ``whale_navs.csv``. Use
+    :func:`risk_return.masked.masked_daily_returns` to keep every date. Pass
+    ``dropna=False`` to keep the NaN rows.
+    """
+    frame, restore = _as_pandas(navs)
+    returns = frame.pct_change(fill_method=None)
+    if dropna:
+        returns = returns.dropna()
+    return restore(returns)
+
+
+def compute_cumulative_returns(daily_returns):
+    """Cumulative growth of 1 unit invested, ``(1 + returns).cumprod()``."""
+    frame, restore = _as_pandas(daily_returns)
+    return restore((1 + frame).cumprod())
+
+
+def daily_std(daily_returns):
+    """Sample standard deviation (ddof=1) of the daily returns."""
+    frame, restore = _as_pandas(daily_returns)
+    return restore(frame.std())
+
+
+def annualized_std(daily_returns, trading_days=TRADING_DAYS):
+    """Daily standard deviation scaled by ``sqrt(trading_days)``."""
+    frame, restore = _as_pandas(daily_returns)
+    return restore(frame.std() * np.sqrt(trading_days))
+
+
+def annualized_average_returns(daily_returns, trading_days=TRADING_DAYS):
+    """Mean daily return scaled by ``trading_days``."""
+    frame, restore = _as_pandas(daily_returns)
+    return restore(frame.mean() * trading_days)
+
+
+def annualized_sharpe(daily_returns, trading_days=TRADING_DAYS):
+    """Annualized Sharpe ratio (zero risk-free rate)."""
+    frame, restore = _as_pandas(daily_returns)
+    sharpe = (frame.mean() * trading_days) / (frame.std() * np.sqrt(trading_days))
+    return restore(sharpe)
+
+
+def rolling_std(daily_returns, window=21):
+    """Rolling sample standard deviation over ``window`` rows."""
+    frame, restore = _as_pandas(daily_returns)
+    return restore(frame.rolling(window=window).std())
+
+
+def rolling_variance(returns, window=60):
+    """Rolling sample variance over ``window`` rows."""
+    frame, restore = _as_pandas(returns)
+    return restore(frame.rolling(window=window).var())
+
+
+def rolling_covariance(daily_returns, benchmark_returns, window=60):
+    """Rolling sample covariance of each column with the benchmark series."""
+    frame, restore = _as_pandas(daily_returns)
+    benchmark = benchmark_returns
+    if not isinstance(benchmark, pd.Series):
+        benchmark = pd.Series(np.asarray(benchmark, dtype=np.float64), index=frame.index)
+    return restore(frame.rolling(window=window).cov(benchmark))
+
+
+def rolling_beta(daily_returns, benchmark_returns, window=60):
+    """Rolling beta: covariance with the benchmark divided by benchmark variance."""
+    frame, restore = _as_pandas(daily_returns)
+    benchmark = benchmark_returns
+    if not isinstance(benchmark, pd.Series):
+        benchmark = pd.Series(np.asarray(benchmark, dtype=np.float64), index=frame.index)
+    covariance = frame.rolling(window=window).cov(benchmark)
+    variance = benchmark.rolling(window=window).var()
+    if isinstance(covariance, pd.Series):
+        return restore(covariance / variance)
+    return restore(covariance.div(variance, axis=0))
+
+
+def drawdowns(cumulative_returns):
+    """Fractional decline of each cumulative return series from its running peak."""
+    values, index, columns = as_matrix(cumulative_returns)
+    result = values / np.maximum.accumulate(values, axis=0) - 1.0
+    return wrap_rows(result, index, columns, np.ndim(cumulative_returns) == 1)
+
+
+def max_drawdown(cumulative_returns):
+    """Largest peak-to-trough decline per column, as a negative fraction."""
+    values, _, columns = as_matrix(cumulative_returns)
+    result = (values / np.maximum.accumulate(values, axis=0) - 1.0).min(axis=0)
+    return wrap_columns(result, columns, np.ndim(cumulative_returns) == 1)
+
+
+def annualized_sortino(daily_returns, trading_days=TRADING_DAYS, target=0.0):
+    """Annualized Sortino ratio: excess return over downside deviation below ``target``."""
+    values, _, columns = as_matrix(daily_returns)
+    excess = values - target
+    downside = np.sqrt((np.minimum(excess, 0.0) ** 2).mean(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = excess.mean(axis=0) * trading_days / (downside * np.sqrt(trading_days))
+    return wrap_columns(result, columns, np.ndim(daily_returns) == 1)
+
+
+def _tail_count(n_rows, level):
+    """Number of worst observations in the ``1 - level`` tail (at least one)."""
+    return max(1, int(np.ceil(n_rows * (1.0 - level) - 1e-9)))
+
+
+def _lower_quantile(values, level, axis=0):
+    """``np.quantile(values, 1 - level, axis)`` via a partial sort of two order statistics."""
+    n_rows = values.shape[axis]
+    position = (n_rows - 1) * (1.0 - level)
+    low = int(np.floor(position))
+    high = min(low + 1, n_rows - 1)
+    partitioned = np.partition(values, (low, high), axis=axis)
+    weight = position - low
+    lower = np.take(partitioned, low, axis=axis)
+    upper = np.take(partitioned, high, axis=axis)
+    return lower + (upper - lower) * weight
+
+
+def historical_var(daily_returns, level=0.95):
+    """Historical value at risk: the loss not exceeded with probability ``level``.
+
+    Reported as a positive fraction, ``-quantile(returns, 1 - level)``.
+    """
+    values, _, columns = as_matrix(daily_returns)
+    return wrap_columns(-_lower_quantile(values, level), columns, np.ndim(daily_returns) == 1)
+
+
+def historical_cvar(daily_returns, level=0.95):
+    """Historical conditional VaR (expected shortfall): mean loss over the worst ``1 - level`` of days."""
+    values, _, columns = as_matrix(daily_returns)
+    count = _tail_count(values.shape[0], level)
+    worst = np.partition(values, count - 1, axis=0)[:count]
+    return wrap_columns(-worst.mean(axis=0), columns, np.ndim(daily_returns) == 1)
+
+
+def _normal_tail(level):
+    distribution = NormalDist()
+    z = distribution.inv_cdf(1.0 - level)
+    return z, distribution.pdf(z) / (1.0 - level)
+
+
+def parametric_var(daily_returns, level=0.95):
+    """Gaussian value at risk from the sample mean and std, as a positive fraction."""
+    values, _, columns = as_matrix(daily_returns)
+    z, _ = _normal_tail(level)
+    result = -(values.mean(axis=0) + z * values.std(axis=0, ddof=1))
+    return wrap_columns(result, columns, np.ndim(daily_returns) == 1)
+
+
+def parametric_cvar(daily_returns, level=0.95):
+    """Gaussian expected shortfall from the sample mean and std, as a positive fraction."""
+    values, _, columns = as_matrix(daily_returns)
+    _, tail = _normal_tail(level)
+    result = -(values.mean(axis=0) - tail * values.std(axis=0, ddof=1))
+    return wrap_columns(result, columns, np.ndim(daily_returns) == 1)
+
+
+def tail_risk(daily_returns, level=0.95, trading_days=TRADING_DAYS):
+    """Per-column table of max drawdown, Sortino, and historical/parametric VaR and CVaR."""
+    frame = daily_returns if isinstance(daily_returns, pd.DataFrame) else pd.DataFrame(daily_returns)
+    return pd.DataFrame({
+        "max_drawdown": max_drawdown(compute_cumulative_returns(frame)),
+        "sortino": annualized_sortino(frame, trading_days),
+        "historical_var": historical_var(frame, level),
+        "historical_cvar": historical_cvar(frame, level),
+        "parametric_var": parametric_var(frame, level),
+        "parametric_cvar": parametric_cvar(frame, level),
+    })
+
+
+def _rolling_apply(values, window, func, max_block_bytes):
+    """Apply ``func`` to blocks of trailing windows; the first ``window - 1`` rows are NaN.
+
+    ``func`` gets a C-contiguous (rows, columns, window) copy it may modify;
+    the number of rows per block keeps that copy within ``max_block_bytes``.
+    """
+    out = np.full(values.shape, np.nan)
+    if window > values.shape[0]:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    block_rows = max(1, max_block_bytes // (window * max(values.shape[1], 1) * 8))
+    for start in range(0, windows.shape[0], block_rows):
+        block = np.array(windows[start:start + block_rows], order="C")
+        out[window - 1 + start:window - 1 + start + block.shape[0]] = func(block)
+    return out
+
+
+def rolling_max_drawdown(cumulative_returns, window=252):
+    """Worst drawdown within each trailing ``window`` rows.
+
+    Every window is advanced one row at a time with a running peak, so the
+    scratch space is a few arrays the size of the input, whatever the window.
+    """
+    values, index, columns = as_matrix(cumulative_returns)
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[0]:
+        n_windows = values.shape[0] - window + 1
+        peak = values[:n_windows].copy()
+        worst = np.zeros_like(peak)
+        drawdown = np.empty_like(peak)
+        for offset in range(1, window):
+            current = values[offset:offset + n_windows]
+            np.maximum(peak, current, out=peak)
+            np.divide(current, peak, out=drawdown)
+            drawdown -= 1.0
+            np.minimum(worst, drawdown, out=worst)
+        out[window - 1:] = worst
+    return wrap_rows(out, index, columns, np.ndim(cumulative_returns) == 1)
+
+
+def rolling_sortino(daily_returns, window=60, trading_days=TRADING_DAYS, target=0.0):
+    """Annualized Sortino ratio over each trailing ``window`` rows, from running sums."""
+    values, index, columns = as_matrix(daily_returns)
+    excess = values - target
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[0]:
+        sums = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), excess]), axis=0)
+        downside = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), np.minimum(excess, 0.0) ** 2]), axis=0)
+        mean = (sums[window:] - sums[:-window]) / window
+        deviation = np.sqrt(np.maximum(downside[window:] - downside[:-window], 0.0) / window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[window - 1:] = mean * trading_days / (deviation * np.sqrt(trading_days))
+    return wrap_rows(out, index, columns, np.ndim(daily_returns) == 1)
+
+
+def rolling_historical_var(daily_returns, window=60, level=0.95, max_block_bytes=DEFAULT_MAX_BLOCK_BYTES):
+    """Historical VaR over each trailing ``window`` rows."""
+    values, index, columns = as_matrix(daily_returns)
+    position = (window - 1) * (1.0 - level)
+    low = int(np.floor(position))
+    high = min(low + 1, window - 1)
+
+    def quantile(block):
+        block.partition((low, high), axis=2)
+        lower, upper = block[:, :, low], block[:, :, high]
+        return -(lower + (upper - lower) * (position - low))
+
+    result = _rolling_apply(values, window, quantile, max_block_bytes)
+    return wrap_rows(result, index, columns, np.ndim(daily_returns) == 1)
+
+
+def rolling_historical_cvar(daily_returns, window=60, level=0.95, max_block_bytes=DEFAULT_MAX_BLOCK_BYTES):
+    """Historical CVaR over each trailing ``window`` rows."""
+    values, index, columns = as_matrix(daily_returns)
+    count = _tail_count(window, level)
+
+    def shortfall(block):
+        block.partition(count - 1, axis=2)
+        return -block[:, :, :count].mean(axis=2)
+
+    result = _rolling_apply(values, window, shortfall, max_block_bytes)
+    return wrap_rows(result, index, columns, np.ndim(daily_returns) == 1)
@@ -0,0 +1,117 @@
+"""Rolling metrics for return matrices larger than memory.
+
+Inputs are read from, and outputs written to, ``.npy`` files opened as
+:class:`numpy.memmap`. The time axis is processed in row blocks; each block is
+read together with the ``window - 1`` rows before it so its first windows are
+complete, and only the block's own rows are written. With C-ordered
+(rows x funds) files each block is one contiguous read and one contiguous
+write, so the I/O is sequential. Fortran-ordered inputs, such as the NAV
+cache, are read in near-square tiles of rows x columns instead, so each
+column is still read in long runs. Resident memory is bounded by
+``max_block_bytes`` rather than by the panel size.
+
+Rows containing NaN are not dropped here; clean the returns first (or use
+:mod:`risk_return.masked` on blocks that fit in memory).
+"""
+import math
+from pathlib import Path
+
+import numpy as np
+
+from .rolling import rolling_beta_multi, rolling_std_multi
+
+# Scratch budget per block; the rolling kernels use about 8 float64 arrays of the block's size
+DEFAULT_MAX_BLOCK_BYTES = 256 * 2 ** 20
+_SCRATCH_ARRAYS = 8
+
+
+def _open(source):
+    """A 2-D read-only array from a ``.npy`` path, or ``source`` itself if it is already an array."""
+    if isinstance(source, (str, Path)):
+        return np.load(source, mmap_mode="r")
+    return source
+
+
+def _tile_shape(array, window, max_block_bytes):
+    """``(rows, columns)`` per tile: full rows for C order, near-square tiles for Fortran order.
+
+    A C-ordered row block is one contiguous run on disk. In a Fortran-ordered
+    file (such as the NAV cache) every column is a separate run, so tiles are
+    made roughly square to keep each column's run, and each output row's
+    run, long.
+    """
+    n_rows, n_columns = array.shape
+    cells = max(max_block_bytes // (8 * _SCRATCH_ARRAYS), 1)
+    if array.flags.f_contiguous and not array.flags.c_contiguous:
+        rows = max(math.isqrt(cells), window)
+        return rows, max(cells // rows, 1)
+    return max(cells // max(n_columns, 1), window), max(n_columns, 1)
+
+
+def _create(out_path, shape, dtype):
+    return np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=shape)
+
+
+def navs_to_returns_memmap(navs, out_path, dtype=np.float32, max_block_bytes=DEFAULT_MAX_BLOCK_BYTES):
+    """Write ``navs[1:] / navs[:-1] - 1`` to a C-ordered ``.npy`` memmap; returns the output memmap.
+
+    ``navs`` may be a path to an ``.npy`` file (such as the Fortran-ordered
+    NAV cache written by :mod:`risk_return.cache`) or an array. Returns are
+    computed in float64 and stored as ``dtype``.
+    """
+    navs = _open(navs)
+    out = _create(out_path, (max(navs.shape[0] - 1, 0), navs.shape[1]), dtype)
+    step, width = _tile_shape(navs, 2, max_block_bytes)
+    for first in range(0, navs.shape[1], width):
+        columns = slice(first, first + width)
+        for start in range(0, out.shape[0], step):
+            stop = min(start + step, out.shape[0])
+            block = np.asarray(navs[start:stop + 1, columns], dtype=np.float64)
+            out[start:stop, columns] = block[1:] / block[:-1] - 1.0
+    out.flush()
+    return out
+
+
+def _rolling_memmap(returns, out_path, window, dtype, max_block_bytes, compute):
+    """Fill ``out_path`` tile by tile; ``compute(block, rows)`` gets each tile plus its row slice."""
+    out = _create(out_path, returns.shape, dtype)
+    step, width = _tile_shape(returns, window, max_block_bytes)
+    overlap = window - 1
+    for first in range(0, returns.shape[1], width):
+        columns = slice(first, first + width)
+        for start in range(0, returns.shape[0], step):
+            stop = min(start + step, returns.shape[0])
+            lead = min(overlap, start)
+            rows = slice(start - lead, stop)
+            block = np.asarray(returns[rows, columns], dtype=np.float64)
+            out[start:stop, columns] = compute(block, rows)[lead:]
+    out.flush()
+    return out
+
+
+def rolling_std_memmap(returns, out_path, window=21, dtype=np.float32, max_block_bytes=DEFAULT_MAX_BLOCK_BYTES):
+    """Rolling std of every column of an on-disk returns matrix into ``out_path``.
+
+    Returns the output memmap; the first ``window - 1`` rows are NaN.
+    """
+    returns = _open(returns)
+    return _rolling_memmap(
+        returns, out_path, window, dtype, max_block_bytes,
+        lambda block, rows: rolling_std_multi(block, (window,))[window],
+    )
+
+
+def rolling_beta_memmap(returns, benchmark_column, out_path, window=60, dtype=np.float32,
+                        max_block_bytes=DEFAULT_MAX_BLOCK_BYTES):
+    """Rolling beta of every column against column ``benchmark_column`` into ``out_path``.
+
+    The output has the same columns as the input (the benchmark's own beta
+    is 1), so fund positions line up with the returns file.
+    """
+    returns = _open(returns)
+
+    def beta(block, rows):
+        benchmark = np.asarray(returns[rows, benchmark_column], dtype=np.float64)
+        return rolling_beta_multi(block, benchmark, (window,))[window]
+
+    return _rolling_memmap(returns, out_path, window, dtype, max_block_bytes, beta)
@@ -0,0 +1,141 @@
+"""Run the full metric set over fund shards in a process pool.
+
+The NAV matrix, the benchmark's daily returns and every output matrix live in
+``multiprocessing.shared_memory`` blocks. Workers receive only block names,
+shapes and a column range, attach to the blocks, and write their shard of the
+daily returns, cumulative returns, rolling std and rolling beta straight into
+the shared outputs, so no large arrays are pickled in either direction. Only
+the small per-column summary moments travel back through the pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .fused import RunningMoments
+from .metrics import BENCHMARK, TRADING_DAYS
+from .rolling import rolling_beta_multi, rolling_std_multi
+
+
+def _create_shared(stack, shape, source=None):
+    """Allocate a float64 shared block (closed and unlinked when ``stack`` exits)."""
+    nbytes = max(int(np.prod(shape)) * 8, 1)
+    block = shared_memory.SharedMemory(create=True, size=nbytes)
+    stack.callback(block.unlink)
+    stack.callback(block.close)
+    array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    if source is not None:
+        array[...] = source
+    return block.name, array
+
+
+def _attach(name, shape):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _compute_shard(arrays, task):
+    start, stop = task["columns"]
+    navs = arrays["navs"][:, start:stop]
+    returns = (navs[1:] / navs[:-1] - 1.0)[task["keep"]]
+    arrays["daily_returns"][:, start:stop] = returns
+    arrays["cumulative_returns"][:, start:stop] = np.cumprod(1.0 + returns, axis=0)
+    arrays["rolling_std"][:, start:stop] = rolling_std_multi(returns, (task["std_window"],))[task["std_window"]]
+    arrays["rolling_beta"][:, start:stop] = rolling_beta_multi(
+        returns, arrays["benchmark_returns"], (task["beta_window"],),
+    )[task["beta_window"]]
+    moments = RunningMoments(stop - start).update(returns)
+    return start, moments.count, moments.mean, moments.m2, moments.growth
+
+
+def _run_shard(task):
+    """Worker entry point: compute every metric for the task's column range."""
+    blocks = []
+    arrays = {}
+    try:
+        for key, (name, shape) in task["blocks"].items():
+            block, arrays[key] = _attach(name, shape)
+            blocks.append(block)
+        return _compute_shard(arrays, task)
+    finally:
+        # Views must be released before the blocks can be closed
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+
+def _shards(n_columns, n_shards):
+    bounds = np.linspace(0, n_columns, n_shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def parallel_report(navs, benchmark=BENCHMARK, workers=None, std_window=21, beta_window=60,
+                    trading_days=TRADING_DAYS):
+    """Compute the risk report for a NAV DataFrame with ``workers`` processes.
+
+    Returns a dict of DataFrames: ``daily_returns``, ``cumulative_returns``,
+    ``rolling_std``, ``rolling_beta`` (fund columns only) and ``summary``.
+    ``workers=1`` runs the shard in-process; ``None`` uses every CPU.
+    """
+    workers = workers or os.cpu_count() or 1
+    columns = navs.columns
+    values = navs.to_numpy(dtype=np.float64)
+    # Same rows as compute_daily_returns (no forward fill): a NaN anywhere drops the date
+    row_ok = ~np.isnan(values).any(axis=1)
+    keep = np.flatnonzero(row_ok[1:] & row_ok[:-1])
+    index = navs.index[1:][keep]
+    bench_navs = values[:, columns.get_loc(benchmark)]
+    benchmark_returns = (bench_navs[1:] / bench_navs[:-1] - 1.0)[keep]
+    out_shape = (keep.shape[0], values.shape[1])
+
+    with ExitStack() as stack:
+        blocks = {}
+        arrays = {}
+        for key, shape, source in [
+            ("navs", values.shape, values),
+            ("benchmark_returns", benchmark_returns.shape, benchmark_returns),
+            ("daily_returns", out_shape, None),
+            ("cumulative_returns", out_shape, None),
+            ("rolling_std", out_shape, None),
+            ("rolling_beta", out_shape, None),
+        ]:
+            name, arrays[key] = _create_shared(stack, shape, source)
+            blocks[key] = (name, shape)
+        # Registered last so the views are dropped before the blocks close
+        stack.callback(arrays.clear)
+        del values
+
+        tasks = [
+            {
+                "blocks": blocks,
+                "columns": shard,
+                "keep": keep,
+                "std_window": std_window,
+                "beta_window": beta_window,
+            }
+            for shard in _shards(len(columns), workers)
+        ]
+        if workers == 1:
+            results = [_run_shard(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_run_shard, tasks))
+
+        moments = RunningMoments(len(columns))
+        for start, count, mean, m2, growth in results:
+            stop = start + mean.shape[0]
+            moments.count = count
+            moments.mean[start:stop] = mean
+            moments.m2[start:stop] = m2
+            moments.growth[start:stop] = growth
+
+        report = {
+            key: pd.DataFrame(arrays[key].copy(), index=index, columns=columns)
+            for key in ("daily_returns", "cumulative_returns", "rolling_std", "rolling_beta")
+        }
+    report["rolling_beta"] = report["rolling_beta"].drop(columns=benchmark)
+    report["summary"] = moments.table(columns, trading_days)
+    return report
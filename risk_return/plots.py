@@ -0,0 +1,44 @@
+"""Optional figures matching the notebook.
+
+matplotlib is imported only when :func:`save_figures` is called, so batch
+runs that skip plotting never pay for it.
+"""
+from pathlib import Path
+
+
+def save_figures(report, output_dir, benchmark):
+    """Render the notebook's figures for ``report`` into PNG files; returns their paths."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    output_dir = Path(output_dir)
+    daily_returns = report["daily_returns"]
+    fund_only = daily_returns.drop(columns=benchmark)
+    figures = [
+        ("daily_returns", lambda: daily_returns.plot(figsize=(20, 10), title="Whale Daily Returns", legend=True)),
+        ("cumulative_returns", lambda: report["cumulative_returns"].plot(
+            figsize=(20, 10), title="Whale Cumulative Daily Returns", legend=True)),
+        ("daily_returns_box", lambda: daily_returns.plot(
+            kind="box", figsize=(20, 10), title="Whale Daily Returns, Box Plot", legend=True)),
+        ("fund_daily_returns_box", lambda: fund_only.plot(
+            kind="box", figsize=(20, 10), title="Fund Daily Returns, Box Plot", legend=True)),
+        ("sharpe", lambda: report["summary"]["sharpe"].sort_values().plot(
+            figsize=(5, 5), kind="bar", title="Whales Annualized Sharpe Ratio")),
+    ]
+    for window, rolling_std in report["rolling_std"].items():
+        figures.append((f"rolling_std_{window}", lambda frame=rolling_std, window=window: frame.plot(
+            figsize=(20, 10), title=f"Whale {window} day rolling standard deviations")))
+    for window, rolling_beta in report["rolling_beta"].items():
+        figures.append((f"rolling_beta_{window}", lambda frame=rolling_beta, window=window: frame.plot(
+            figsize=(20, 10), title=f"Rolling {window} Beta", legend=True)))
+
+    paths = []
+    for name, draw in figures:
+        axes = draw()
+        path = output_dir / f"{name}.png"
+        axes.get_figure().savefig(path)
+        plt.close(axes.get_figure())
+        paths.append(path)
+    return paths
@@ -0,0 +1,135 @@
+"""Constant-time statistics over arbitrary date ranges.
+
+:class:`PrefixIndex` stores, per fund, cumulative sums of the daily returns,
+their squares, their cross-products with the benchmark and their log growth
+``log(1 + r)``. The mean, std, Sharpe, beta and total return of any fund over
+any ``[start, end]`` range are then differences of two rows of those sums, so
+a question like "how volatile was 2016-2017?" costs O(1) per fund instead of
+re-slicing the returns. :meth:`PrefixIndex.batch` answers many ranges at once
+with fancy indexing.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import BENCHMARK, TRADING_DAYS
+from .rolling import prefix_sums
+
+# Batched range statistics; every field is a (ranges x funds) array, except
+# ``observations`` which has one entry per range
+RangeStats = namedtuple(
+    "RangeStats",
+    ["funds", "observations", "mean", "std", "annualized_std", "sharpe", "beta", "total_return"],
+)
+
+
+def _as_dates(values):
+    return np.atleast_1d(np.asarray(pd.to_datetime(values), dtype="datetime64[ns]"))
+
+
+class PrefixIndex:
+    """Prefix sums of a returns matrix for O(1) range queries."""
+
+    def __init__(self, daily_returns, benchmark=BENCHMARK, trading_days=TRADING_DAYS):
+        if benchmark not in daily_returns.columns:
+            raise KeyError(f"benchmark column {benchmark!r} not found")
+        self.columns = list(daily_returns.columns)
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        self.benchmark = benchmark
+        self.trading_days = trading_days
+        self.dates = daily_returns.index.to_numpy(dtype="datetime64[ns]")
+
+        values = daily_returns.to_numpy(dtype=np.float64)
+        bench = daily_returns[benchmark].to_numpy(dtype=np.float64)
+        # Centering keeps the sums small so differences over short ranges do
+        # not cancel; the centers are added back to the means on query
+        self.center = values.mean(axis=0) if len(values) else np.zeros(values.shape[1])
+        self.bench_center = bench.mean() if len(bench) else 0.0
+        x = values - self.center
+        y = bench - self.bench_center
+        self.sum_x = prefix_sums(x)
+        self.sum_xx = prefix_sums(x * x)
+        self.sum_xy = prefix_sums(x * y[:, np.newaxis])
+        self.sum_y = prefix_sums(y)
+        self.sum_yy = prefix_sums(y * y)
+        self.sum_log = prefix_sums(np.log1p(values))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def positions(self, starts=None, ends=None):
+        """Half-open row bounds ``(lo, hi)`` for inclusive date ranges; ``None`` means unbounded."""
+        if starts is None:
+            lo = np.zeros(1, dtype=np.intp)
+        else:
+            lo = np.searchsorted(self.dates, _as_dates(starts), "left")
+        if ends is None:
+            hi = np.full(1, len(self.dates), dtype=np.intp)
+        else:
+            hi = np.searchsorted(self.dates, _as_dates(ends), "right")
+        return np.broadcast_arrays(lo, hi)
+
+    def fund_positions(self, funds=None):
+        if funds is None:
+            return np.arange(len(self.columns))
+        missing = [fund for fund in funds if fund not in self._positions]
+        if missing:
+            raise KeyError(f"unknown funds: {', '.join(map(str, missing))}")
+        return np.array([self._positions[fund] for fund in funds], dtype=np.intp)
+
+    def batch(self, starts=None, ends=None, funds=None):
+        """Statistics for every (range, fund) pair as a :class:`RangeStats`.
+
+        ``starts`` and ``ends`` are date-likes or equal-length sequences of
+        them (inclusive). Every statistic of an empty range is NaN; the
+        std, Sharpe and beta also need at least two observations.
+        """
+        lo, hi = self.positions(starts, ends)
+        hi = np.maximum(hi, lo)
+        cols = self.fund_positions(funds)
+        n = (hi - lo).astype(np.float64)[:, np.newaxis]
+
+        def window(sums):
+            # Gather only the requested funds' rows, so a range costs O(len(funds))
+            return sums[hi[:, np.newaxis], cols] - sums[lo[:, np.newaxis], cols]
+
+        sx, sxx, sxy, slog = window(self.sum_x), window(self.sum_xx), window(self.sum_xy), window(self.sum_log)
+        sy = (self.sum_y[hi] - self.sum_y[lo])[:, np.newaxis]
+        syy = (self.sum_yy[hi] - self.sum_yy[lo])[:, np.newaxis]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n > 0, self.center[cols] + sx / n, np.nan)
+            variance = np.where(n > 1, np.maximum(sxx - sx * sx / n, 0.0) / (n - 1), np.nan)
+            std = np.sqrt(variance)
+            annualized_std = std * np.sqrt(self.trading_days)
+            sharpe = mean * self.trading_days / annualized_std
+            beta = np.where(n > 1, (sxy - sx * sy / n) / (syy - sy * sy / n), np.nan)
+            total_return = np.where(n > 0, np.expm1(slog), np.nan)
+
+        return RangeStats(
+            [self.columns[i] for i in cols],
+            (hi - lo),
+            mean,
+            std,
+            annualized_std,
+            sharpe,
+            beta,
+            total_return,
+        )
+
+    def stats(self, start=None, end=None, funds=None):
+        """One range as a DataFrame indexed by fund."""
+        result = self.batch(start, end, funds)
+        return pd.DataFrame(
+            {
+                "observations": int(result.observations[0]),
+                "mean": result.mean[0],
+                "std": result.std[0],
+                "annualized_std": result.annualized_std[0],
+                "sharpe": result.sharpe[0],
+                "beta": result.beta[0],
+                "total_return": result.total_return[0],
+            },
+            index=result.funds,
+        )
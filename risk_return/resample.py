@@ -0,0 +1,86 @@
+"""Compounding daily returns to weekly, monthly and quarterly returns.
+
+The period boundaries are found once from the date index, and every fund is
+compounded in the same pass as a segmented sum of ``log(1 + r)``
+(``np.add.reduceat``) instead of a per-group ``apply``. Statistics at a
+coarser frequency are annualized with that frequency's number of periods per
+year (:data:`PERIODS_PER_YEAR`), so one loaded panel yields daily, weekly,
+monthly and quarterly reports.
+"""
+import numpy as np
+import pandas as pd
+
+from .fused import fused_summary
+from .metrics import BENCHMARK, TRADING_DAYS
+
+# Periods per year used to annualize statistics at each frequency
+PERIODS_PER_YEAR = {"D": TRADING_DAYS, "W": 52, "M": 12, "Q": 4}
+
+
+def periods_per_year(freq):
+    """Annualization factor for ``freq`` (``"D"``, ``"W"``, ``"M"`` or ``"Q"``)."""
+    try:
+        return PERIODS_PER_YEAR[freq]
+    except KeyError:
+        raise ValueError(f"unsupported frequency {freq!r}; expected one of {', '.join(PERIODS_PER_YEAR)}") from None
+
+
+def period_starts(index, freq):
+    """Row positions where a new ``freq`` period begins in a sorted DatetimeIndex."""
+    periods_per_year(freq)
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("resampling needs a DatetimeIndex")
+    if len(index) == 0:
+        return np.zeros(0, dtype=np.intp)
+    codes = index.to_period(freq).asi8
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def resample_returns(daily_returns, freq="M"):
+    """Compound daily returns into ``freq`` returns, labelled by each period's last date.
+
+    A period's return is ``prod(1 + r) - 1`` over its rows; a NaN anywhere in
+    the period makes that fund's period return NaN. ``"D"`` returns the input.
+    """
+    if freq == "D":
+        return daily_returns
+    starts = period_starts(daily_returns.index, freq)
+    values = daily_returns.to_numpy(dtype=np.float64)
+    if len(starts):
+        compounded = np.expm1(np.add.reduceat(np.log1p(values), starts, axis=0))
+        index = daily_returns.index[np.r_[starts[1:], len(values)] - 1]
+    else:
+        compounded, index = values[:0], daily_returns.index[:0]
+    if isinstance(daily_returns, pd.Series):
+        return pd.Series(compounded, index=index, name=daily_returns.name)
+    return pd.DataFrame(compounded, index=index, columns=daily_returns.columns)
+
+
+def _betas(values, benchmark_values):
+    x = values - values.mean(axis=0)
+    y = benchmark_values - benchmark_values.mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x * y[:, np.newaxis]).sum(axis=0) / (y * y).sum()
+
+
+def frequency_summary(daily_returns, benchmark=BENCHMARK, freqs=("D", "W", "M", "Q"), trading_days=TRADING_DAYS):
+    """Summary table per frequency, each annualized with its own periods per year.
+
+    Returns ``{freq: DataFrame}``; each table has the :func:`fused_summary`
+    columns plus ``observations`` and ``beta`` against ``benchmark`` at that
+    frequency. Daily statistics are annualized with ``trading_days``.
+    """
+    if benchmark not in daily_returns.columns:
+        raise KeyError(f"benchmark column {benchmark!r} not found")
+    summaries = {}
+    for freq in freqs:
+        returns = resample_returns(daily_returns, freq)
+        summary = fused_summary(returns, trading_days if freq == "D" else periods_per_year(freq))
+        values = returns.to_numpy(dtype=np.float64)
+        summary.insert(0, "observations", len(values))
+        if len(values) > 1:
+            summary["beta"] = _betas(values, returns[benchmark].to_numpy(dtype=np.float64))
+        else:
+            summary["beta"] = np.nan
+        summaries[freq] = summary
+    return summaries
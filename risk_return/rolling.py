@@ -0,0 +1,169 @@
+"""Rolling statistics for whole return matrices from running sums.
+
+Pandas computes ``rolling(60).cov(benchmark)`` column by column. Here every
+fund is handled at once: prefix sums of the returns, the benchmark and their
+cross-products are built in one pass over the 2-D array, and each window's sum
+is the difference of two prefix rows (the running "add the new row, remove the
+oldest" update, vectorized). The cost is O(rows x funds) no matter how long
+the window is, and the same prefix sums serve every requested window.
+
+Inputs must be free of NaNs (the ``pct_change().dropna()`` output).
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from ._arrays import as_matrix, wrap_rows
+
+# Horizons reported by default: month, quarter, half-year and year
+DEFAULT_WINDOWS = (21, 60, 120, 252)
+
+
+def prefix_sums(values):
+    """Cumulative sums along axis 0 with a leading row of zeros."""
+    out = np.zeros((values.shape[0] + 1,) + values.shape[1:], dtype=np.float64)
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+def window_sums(prefix, window, partial=False):
+    """Sums over each trailing ``window`` rows.
+
+    The first ``window - 1`` rows are NaN, or with ``partial=True`` the sums
+    over the shorter windows available there.
+    """
+    n_rows = prefix.shape[0] - 1
+    if partial:
+        ends = np.arange(1, n_rows + 1)
+        return prefix[ends] - prefix[np.maximum(ends - window, 0)]
+    out = np.full((n_rows,) + prefix.shape[1:], np.nan)
+    if window <= n_rows:
+        out[window - 1:] = prefix[window:] - prefix[:n_rows - window + 1]
+    return out
+
+
+def _centered(values):
+    # Shifting by the column mean leaves (co)variances unchanged and keeps the
+    # prefix sums small, avoiding cancellation on long histories
+    if values.shape[0] == 0:
+        return values
+    return values - values.mean(axis=0)
+
+
+def _check_window(window):
+    if window < 2:
+        raise ValueError(f"window must be at least 2, got {window}")
+
+
+def rolling_std_multi(daily_returns, windows=DEFAULT_WINDOWS):
+    """Rolling sample std of every column for each window, as ``{window: result}``."""
+    values, index, columns = as_matrix(daily_returns)
+    squeeze = np.ndim(daily_returns) == 1
+    x = _centered(values)
+    sum_x = prefix_sums(x)
+    sum_xx = prefix_sums(x * x)
+    results = {}
+    for window in windows:
+        _check_window(window)
+        sx = window_sums(sum_x, window)
+        sxx = window_sums(sum_xx, window)
+        variance = (sxx - sx * sx / window) / (window - 1)
+        np.maximum(variance, 0.0, out=variance, where=~np.isnan(variance))
+        results[window] = wrap_rows(np.sqrt(variance), index, columns, squeeze)
+    return results
+
+
+def rolling_beta_multi(daily_returns, benchmark_returns, windows=DEFAULT_WINDOWS):
+    """Rolling beta of every column against the benchmark for each window.
+
+    Returns ``{window: result}``; each result has the shape and labels of
+    ``daily_returns`` and matches ``rolling(window).cov(benchmark) /
+    benchmark.rolling(window).var()``.
+    """
+    values, index, columns = as_matrix(daily_returns)
+    squeeze = np.ndim(daily_returns) == 1
+    benchmark = np.asarray(benchmark_returns, dtype=np.float64).reshape(-1)
+    if benchmark.shape[0] != values.shape[0]:
+        raise ValueError("benchmark_returns must have one value per row of daily_returns")
+    x = _centered(values)
+    y = _centered(benchmark)
+    sum_x = prefix_sums(x)
+    sum_xy = prefix_sums(x * y[:, np.newaxis])
+    sum_y = prefix_sums(y)
+    sum_yy = prefix_sums(y * y)
+    results = {}
+    for window in windows:
+        _check_window(window)
+        sx = window_sums(sum_x, window)
+        sxy = window_sums(sum_xy, window)
+        sy = window_sums(sum_y, window)
+        syy = window_sums(sum_yy, window)
+        # The (window - 1) denominators of cov and var cancel in the ratio
+        covariance = sxy - sx * (sy / window)[:, np.newaxis]
+        variance = syy - sy * sy / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = covariance / variance[:, np.newaxis]
+        results[window] = wrap_rows(beta, index, columns, squeeze)
+    return results
+
+
+# Rolling exposure cube returned by rolling_exposures. ``covariance``, ``beta``
+# and ``correlation`` have shape (dates, funds, benchmarks, windows).
+Exposures = namedtuple(
+    "Exposures",
+    ["dates", "funds", "benchmarks", "windows", "covariance", "beta", "correlation"],
+)
+
+
+def rolling_exposures(daily_returns, benchmark_returns, windows=DEFAULT_WINDOWS):
+    """Rolling covariance, beta and correlation of every fund against every benchmark.
+
+    ``daily_returns`` is (dates x funds) and ``benchmark_returns`` is
+    (dates x benchmarks), e.g. the S&P 500 plus sector or style indices. The
+    prefix sums of the funds, the benchmarks, their squares and the
+    (dates x funds x benchmarks) cross-products are built once and shared by
+    every window, so each extra window costs one broadcast subtraction.
+    """
+    x, index, funds = as_matrix(daily_returns)
+    y, _, benchmarks = as_matrix(benchmark_returns)
+    if x.shape[0] != y.shape[0]:
+        raise ValueError("daily_returns and benchmark_returns must have the same number of rows")
+    windows = tuple(windows)
+    for window in windows:
+        _check_window(window)
+    x = _centered(x)
+    y = _centered(y)
+    sum_x = prefix_sums(x)
+    sum_xx = prefix_sums(x * x)
+    sum_y = prefix_sums(y)
+    sum_yy = prefix_sums(y * y)
+    sum_xy = prefix_sums(np.einsum("tf,tb->tfb", x, y))
+
+    shape = (x.shape[0], x.shape[1], y.shape[1], len(windows))
+    covariance = np.empty(shape)
+    beta = np.empty(shape)
+    correlation = np.empty(shape)
+    for position, window in enumerate(windows):
+        sx = window_sums(sum_x, window)[:, :, np.newaxis]
+        sxx = window_sums(sum_xx, window)[:, :, np.newaxis]
+        sy = window_sums(sum_y, window)[:, np.newaxis, :]
+        syy = window_sums(sum_yy, window)[:, np.newaxis, :]
+        sxy = window_sums(sum_xy, window)
+        # Co-moments before dividing by (window - 1)
+        cross = sxy - sx * sy / window
+        fund_var = np.maximum(sxx - sx * sx / window, 0.0)
+        bench_var = np.maximum(syy - sy * sy / window, 0.0)
+        covariance[..., position] = cross / (window - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta[..., position] = cross / bench_var
+            correlation[..., position] = cross / np.sqrt(fund_var * bench_var)
+
+    return Exposures(
+        index,
+        None if funds is None else list(funds),
+        None if benchmarks is None else list(benchmarks),
+        windows,
+        covariance,
+        beta,
+        correlation,
+    )
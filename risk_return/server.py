@@ -0,0 +1,257 @@
+"""Long-running asyncio HTTP service answering risk queries from memory.
+
+The NAV panel is loaded once into a :class:`NavStore`, which keeps the daily
+returns, their :class:`~risk_return.ranges.PrefixIndex` and the rolling beta
+for each configured window (with its prefix sums) resident. A query over any
+date range is then a handful of prefix-sum differences per requested fund.
+
+Endpoints (all GET, JSON responses):
+
+``/metrics?funds=A,B&start=2016-01-01&end=2017-12-31&window=60``
+    Per fund: observations, annualized return, std and Sharpe, beta over the
+    range, total return, and the mean and last value of the rolling beta.
+    ``funds``, ``start``, ``end`` and ``window`` are optional.
+``/stats``
+    Request counts, coalesced requests and latency percentiles per endpoint.
+``/health``
+
+Identical queries that arrive while one is in flight share its result rather
+than being computed again.
+
+Usage: python -m risk_return.server Resources/whale_navs.csv --port 8765
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .data import load_navs
+from .metrics import BENCHMARK, TRADING_DAYS, compute_daily_returns
+from .ranges import PrefixIndex
+from .rolling import prefix_sums, rolling_beta_multi
+
+# Latency samples kept per endpoint for the percentiles in /stats
+LATENCY_SAMPLES = 10_000
+
+_ROUTES = ("/metrics", "/stats", "/health")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class QueryError(ValueError):
+    """A query that cannot be answered; reported to the client as HTTP 400."""
+
+
+class NavStore:
+    """Resident returns matrix and precomputed state for range queries."""
+
+    def __init__(self, navs, benchmark=BENCHMARK, windows=(60,), trading_days=TRADING_DAYS):
+        if benchmark not in navs.columns:
+            raise KeyError(f"benchmark column {benchmark!r} not found")
+        self.returns = compute_daily_returns(navs)
+        self.columns = list(self.returns.columns)
+        self.index = PrefixIndex(self.returns, benchmark, trading_days)
+        self.trading_days = trading_days
+        self.rolling_beta = rolling_beta_multi(
+            self.returns.to_numpy(dtype=np.float64), self.returns[benchmark].to_numpy(dtype=np.float64), windows,
+        )
+        # Prefix sums of the defined rolling betas and of their count, so the
+        # mean over any range is two row lookups per fund
+        self.rolling_beta_sums = {
+            window: (prefix_sums(np.nan_to_num(beta)), prefix_sums((~np.isnan(beta)).astype(np.float64)))
+            for window, beta in self.rolling_beta.items()
+        }
+
+    def query(self, funds=None, start=None, end=None, window=60):
+        """Range statistics for ``funds`` between ``start`` and ``end`` (inclusive)."""
+        if window not in self.rolling_beta:
+            raise QueryError(f"window {window} is not precomputed; available: {sorted(self.rolling_beta)}")
+        try:
+            positions = self.index.fund_positions(funds)
+            (lo,), (hi,) = self.index.positions(start, end)
+        except KeyError as error:
+            raise QueryError(error.args[0]) from error
+        except ValueError as error:
+            raise QueryError(f"invalid date: {error}") from error
+        if hi - lo < 2:
+            raise QueryError("the date range must contain at least two return observations")
+
+        stats = self.index.batch(start, end, funds)
+        beta_sum, beta_count = self.rolling_beta_sums[window]
+        count = beta_count[hi, positions] - beta_count[lo, positions]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Ranges shorter than the window have no defined beta: NaN
+            rolling_mean = np.where(count > 0, (beta_sum[hi, positions] - beta_sum[lo, positions]) / count, np.nan)
+        rolling_last = self.rolling_beta[window][hi - 1, positions]
+
+        result = {}
+        for i, fund in enumerate(stats.funds):
+            result[fund] = {
+                "observations": int(stats.observations[0]),
+                "annualized_return": _number(stats.mean[0, i] * self.trading_days),
+                "annualized_std": _number(stats.annualized_std[0, i]),
+                "sharpe": _number(stats.sharpe[0, i]),
+                "beta": _number(stats.beta[0, i]),
+                "total_return": _number(stats.total_return[0, i]),
+                f"rolling_beta_{window}_mean": _number(rolling_mean[i]),
+                f"rolling_beta_{window}_last": _number(rolling_last[i]),
+            }
+        return {
+            "start": str(pd.Timestamp(self.index.dates[lo]).date()),
+            "end": str(pd.Timestamp(self.index.dates[hi - 1]).date()),
+            "funds": result,
+        }
+
+
+def _number(value):
+    """JSON-safe float (NaN and infinities become null)."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class RiskServer:
+    """HTTP front end over a :class:`NavStore` with coalescing and latency stats."""
+
+    def __init__(self, store):
+        self.store = store
+        self.requests = defaultdict(int)
+        self.coalesced = 0
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+        self._in_flight = {}
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening; ``port=0`` picks a free port (see :attr:`port`)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _query(self, params):
+        key = (tuple(params["funds"] or ()), params["start"], params["end"], params["window"])
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, lambda: self.store.query(**params))
+        self._in_flight[key] = future
+        try:
+            return await future
+        finally:
+            del self._in_flight[key]
+
+    def stats(self):
+        endpoints = {}
+        for path, samples in self.latencies.items():
+            millis = np.asarray(samples) * 1000.0
+            endpoints[path] = {
+                "requests": self.requests[path],
+                "p50_ms": float(np.percentile(millis, 50)),
+                "p95_ms": float(np.percentile(millis, 95)),
+                "p99_ms": float(np.percentile(millis, 99)),
+                "max_ms": float(millis.max()),
+            }
+        return {"coalesced": self.coalesced, "endpoints": endpoints}
+
+    async def _route(self, method, target):
+        url = urlsplit(target)
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        if url.path == "/stats":
+            return 200, self.stats()
+        if url.path == "/metrics":
+            query = parse_qs(url.query)
+            funds = query.get("funds", [""])[0]
+            try:
+                params = {
+                    "funds": [fund for fund in funds.split(",") if fund] or None,
+                    "start": query.get("start", [None])[0],
+                    "end": query.get("end", [None])[0],
+                    "window": int(query.get("window", ["60"])[0]),
+                }
+                return 200, await self._query(params)
+            except (QueryError, ValueError) as error:
+                return 400, {"error": str(error)}
+        return 404, {"error": f"no route for {url.path}"}
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain the headers; requests carry no body
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            started = time.perf_counter()
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            except ValueError:
+                status, body, path = 400, {"error": "malformed request line"}, None
+            else:
+                path = urlsplit(target).path
+                # Unknown paths share one bucket so the stats stay bounded
+                path = path if path in _ROUTES else "other"
+                try:
+                    status, body = await self._route(method, target)
+                except Exception as error:  # keep serving after unexpected failures
+                    status, body = 500, {"error": repr(error)}
+            payload = json.dumps(body).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+            if path is not None:
+                self.requests[path] += 1
+                self.latencies[path].append(time.perf_counter() - started)
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m risk_return.server", description="Serve risk queries over HTTP.")
+    parser.add_argument("navs", help="NAV csv with a 'date' column")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--benchmark", default=BENCHMARK)
+    parser.add_argument("--windows", default="60", help="rolling beta windows kept resident, e.g. 21,60,252")
+    parser.add_argument("--trading-days", type=int, default=TRADING_DAYS)
+    args = parser.parse_args(argv)
+
+    store = NavStore(
+        load_navs(args.navs),
+        benchmark=args.benchmark,
+        windows=tuple(int(window) for window in args.windows.split(",")),
+        trading_days=args.trading_days,
+    )
+
+    async def run():
+        server = await RiskServer(store).start(args.host, args.port)
+        print(f"serving {len(store.columns)} series on http://{args.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
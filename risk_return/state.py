@@ -0,0 +1,232 @@
+"""Persistent state for appending one day of NAVs at a time.
+
+:class:`RiskState` holds the last NAV row, the running moments behind the
+full-sample std and Sharpe, the cumulative growth and a ring buffer of the
+most recent returns with running window sums. Appending a day adds the new
+return to the window sums and subtracts the one leaving the window, so an
+update costs O(funds) regardless of how much history is behind it. The window
+sums are recomputed from the ring buffer once per buffer length to stop
+floating-point drift from accumulating.
+"""
+import json
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .fused import RunningMoments
+from .metrics import BENCHMARK, TRADING_DAYS
+
+# Metrics emitted for one appended day; arrays cover every column except
+# ``rolling_beta``, which covers the fund columns only
+DayMetrics = namedtuple(
+    "DayMetrics",
+    ["date", "daily_return", "cumulative_return", "annualized_std", "sharpe", "rolling_std", "rolling_beta"],
+)
+
+
+class RiskState:
+    """Running risk metrics that can be saved, loaded and updated one day at a time."""
+
+    def __init__(self, columns, benchmark=BENCHMARK, std_window=21, beta_window=60, trading_days=TRADING_DAYS):
+        self.columns = list(columns)
+        if benchmark not in self.columns:
+            raise KeyError(f"benchmark column {benchmark!r} not found")
+        if min(std_window, beta_window) < 2:
+            raise ValueError("rolling windows must be at least 2")
+        self.benchmark = benchmark
+        self.benchmark_position = self.columns.index(benchmark)
+        self.fund_positions = [i for i in range(len(self.columns)) if i != self.benchmark_position]
+        self.std_window = std_window
+        self.beta_window = beta_window
+        self.trading_days = trading_days
+
+        n_columns = len(self.columns)
+        self.moments = RunningMoments(n_columns)
+        self.last_date = None
+        self.last_navs = None
+        self.capacity = max(std_window, beta_window)
+        self.buffer = np.zeros((self.capacity, n_columns), dtype=np.float64)
+        self.filled = 0
+        self.position = 0
+        self.updates_since_rebuild = 0
+        self._rebuild_sums()
+
+    @property
+    def fund_columns(self):
+        return [self.columns[i] for i in self.fund_positions]
+
+    def _window_rows(self, window):
+        """The last ``min(window, filled)`` returns in chronological order."""
+        count = min(window, self.filled)
+        rows = (self.position - count + np.arange(count)) % self.capacity
+        return self.buffer[rows]
+
+    def _rebuild_sums(self):
+        std_rows = self._window_rows(self.std_window)
+        self.std_sum = std_rows.sum(axis=0)
+        self.std_sum_sq = (std_rows ** 2).sum(axis=0)
+        beta_rows = self._window_rows(self.beta_window)
+        funds = beta_rows[:, self.fund_positions]
+        benchmark = beta_rows[:, self.benchmark_position]
+        self.beta_sum_x = funds.sum(axis=0)
+        self.beta_sum_xy = (funds * benchmark[:, np.newaxis]).sum(axis=0)
+        self.beta_sum_y = benchmark.sum()
+        self.beta_sum_yy = (benchmark ** 2).sum()
+        self.updates_since_rebuild = 0
+
+    def _push(self, returns):
+        if self.filled >= self.std_window:
+            leaving = self.buffer[(self.position - self.std_window) % self.capacity]
+            self.std_sum -= leaving
+            self.std_sum_sq -= leaving ** 2
+        if self.filled >= self.beta_window:
+            leaving = self.buffer[(self.position - self.beta_window) % self.capacity]
+            funds = leaving[self.fund_positions]
+            benchmark = leaving[self.benchmark_position]
+            self.beta_sum_x -= funds
+            self.beta_sum_xy -= funds * benchmark
+            self.beta_sum_y -= benchmark
+            self.beta_sum_yy -= benchmark ** 2
+
+        self.buffer[self.position] = returns
+        self.position = (self.position + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+
+        funds = returns[self.fund_positions]
+        benchmark = returns[self.benchmark_position]
+        self.std_sum += returns
+        self.std_sum_sq += returns ** 2
+        self.beta_sum_x += funds
+        self.beta_sum_xy += funds * benchmark
+        self.beta_sum_y += benchmark
+        self.beta_sum_yy += benchmark ** 2
+
+        self.updates_since_rebuild += 1
+        if self.updates_since_rebuild >= self.capacity:
+            self._rebuild_sums()
+
+    def _rolling_std(self):
+        window = self.std_window
+        if self.filled < window:
+            return np.full(len(self.columns), np.nan)
+        variance = (self.std_sum_sq - self.std_sum ** 2 / window) / (window - 1)
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    def _rolling_beta(self):
+        window = self.beta_window
+        if self.filled < window:
+            return np.full(len(self.fund_positions), np.nan)
+        covariance = self.beta_sum_xy - self.beta_sum_x * self.beta_sum_y / window
+        variance = self.beta_sum_yy - self.beta_sum_y ** 2 / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return covariance / variance
+
+    def update(self, date, navs):
+        """Append one day of NAVs (one value per column) and return its :class:`DayMetrics`.
+
+        The first call only records the NAVs and returns ``None``; so does a
+        day whose return is NaN for any column, mirroring
+        :func:`~risk_return.metrics.compute_daily_returns` (NAVs are not
+        forward-filled).
+
+        Raises ``ValueError`` if ``date`` is not after the last appended date,
+        so re-running a day cannot append a spurious zero return.
+        """
+        date = pd.Timestamp(date)
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"date {date.date()} is not after the last appended date {self.last_date.date()}")
+        navs = np.asarray(navs, dtype=np.float64).reshape(len(self.columns))
+        previous = self.last_navs
+        self.last_date = date
+        self.last_navs = navs
+        if previous is None:
+            return None
+        returns = navs / previous - 1.0
+        if np.isnan(returns).any():
+            return None
+
+        self.moments.update(returns)
+        self._push(returns)
+
+        variance = self.moments.variance
+        annualized_std = np.sqrt(variance * self.trading_days)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = self.moments.mean * self.trading_days / annualized_std
+        return DayMetrics(
+            self.last_date,
+            returns,
+            self.moments.growth.copy(),
+            annualized_std,
+            sharpe,
+            self._rolling_std(),
+            self._rolling_beta(),
+        )
+
+    @classmethod
+    def from_navs(cls, navs, **options):
+        """Build the state from a NAV history DataFrame in one vectorized pass."""
+        state = cls(navs.columns, **options)
+        values = navs.to_numpy(dtype=np.float64)
+        if values.shape[0] == 0:
+            return state
+        returns = values[1:] / values[:-1] - 1.0
+        returns = returns[~np.isnan(returns).any(axis=1)]
+        state.moments.update(returns)
+        recent = returns[-state.capacity:]
+        state.filled = recent.shape[0]
+        state.position = state.filled % state.capacity
+        state.buffer[:state.filled] = recent
+        state.last_date = pd.Timestamp(navs.index[-1])
+        state.last_navs = values[-1]
+        state._rebuild_sums()
+        return state
+
+    def save(self, path):
+        """Write the state to an ``.npz`` file."""
+        meta = {
+            "columns": self.columns,
+            "benchmark": self.benchmark,
+            "std_window": self.std_window,
+            "beta_window": self.beta_window,
+            "trading_days": self.trading_days,
+            "count": self.moments.count,
+            "filled": self.filled,
+            "position": self.position,
+            "last_date": None if self.last_date is None else self.last_date.isoformat(),
+        }
+        arrays = {
+            "mean": self.moments.mean,
+            "m2": self.moments.m2,
+            "growth": self.moments.growth,
+            "buffer": self.buffer,
+        }
+        if self.last_navs is not None:
+            arrays["last_navs"] = self.last_navs
+        with open(path, "wb") as handle:
+            np.savez(handle, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read a state written by :meth:`save`."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            state = cls(
+                meta["columns"],
+                benchmark=meta["benchmark"],
+                std_window=meta["std_window"],
+                beta_window=meta["beta_window"],
+                trading_days=meta["trading_days"],
+            )
+            state.moments.count = meta["count"]
+            state.moments.mean = data["mean"].copy()
+            state.moments.m2 = data["m2"].copy()
+            state.moments.growth = data["growth"].copy()
+            state.buffer = data["buffer"].copy()
+            if "last_navs" in data:
+                state.last_navs = data["last_navs"].copy()
+        state.filled = meta["filled"]
+        state.position = meta["position"]
+        state.last_date = None if meta["last_date"] is None else pd.Timestamp(meta["last_date"])
+        state._rebuild_sums()
+        return state
@@ -0,0 +1,89 @@
+"""Incremental risk metrics over a NAV file streamed in chunks.
+
+Peak memory is bounded by the chunk size plus the rolling window: between
+chunks the engine only keeps the last NAV row (to compute the next return),
+the running cumulative growth, the running moments used for the summary and
+the trailing ``window - 1`` returns needed by the rolling statistics.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .data import DEFAULT_CHUNK_ROWS, DEFAULT_NAV_PATH, iter_nav_chunks, read_nav_columns
+from .fused import RunningMoments
+from .metrics import BENCHMARK, TRADING_DAYS
+from .rolling import rolling_beta_multi, rolling_std_multi
+
+# Metrics for one chunk of rows; ``rolling_beta`` covers the fund columns only
+ChunkMetrics = namedtuple(
+    "ChunkMetrics",
+    ["dates", "daily_returns", "cumulative_returns", "rolling_std", "rolling_beta"],
+)
+
+
+class StreamingRiskEngine:
+    """Carry returns, cumulative and rolling state across NAV chunks."""
+
+    def __init__(self, columns, benchmark=BENCHMARK, std_window=21, beta_window=60,
+                 trading_days=TRADING_DAYS):
+        self.columns = list(columns)
+        if benchmark not in self.columns:
+            raise KeyError(f"benchmark column {benchmark!r} not found")
+        self.benchmark_position = self.columns.index(benchmark)
+        self.fund_positions = [i for i in range(len(self.columns)) if i != self.benchmark_position]
+        self.fund_columns = [self.columns[i] for i in self.fund_positions]
+        self.std_window = std_window
+        self.beta_window = beta_window
+        self.trading_days = trading_days
+        self.moments = RunningMoments(len(self.columns))
+        self._last_navs = None
+        self._tail = np.empty((0, len(self.columns)), dtype=np.float64)
+
+    def process(self, dates, navs):
+        """Consume the next block of NAV rows and return its :class:`ChunkMetrics`."""
+        navs = np.asarray(navs, dtype=np.float64)
+        dates = np.asarray(dates)
+        if navs.shape[0] == 0:
+            navs = navs.reshape(0, len(self.columns))
+            return ChunkMetrics(dates, navs, navs, navs, navs[:, self.fund_positions])
+        if self._last_navs is None:
+            previous, current, dates = navs[:-1], navs[1:], dates[1:]
+        else:
+            previous = np.vstack([self._last_navs, navs[:-1]])
+            current = navs
+        self._last_navs = navs[-1:]
+
+        returns = current / previous - 1.0
+        # Same rows as compute_daily_returns (no forward fill): any NaN drops the whole date
+        keep = ~np.isnan(returns).any(axis=1)
+        returns, dates = returns[keep], dates[keep]
+
+        cumulative = self.moments.growth * np.cumprod(1.0 + returns, axis=0)
+        self.moments.update(returns)
+
+        history = np.vstack([self._tail, returns])
+        self._tail = history[-(max(self.std_window, self.beta_window) - 1):]
+        n_new = returns.shape[0]
+        std = rolling_std_multi(history, (self.std_window,))[self.std_window]
+        beta = rolling_beta_multi(
+            history[:, self.fund_positions],
+            history[:, self.benchmark_position],
+            (self.beta_window,),
+        )[self.beta_window]
+        std, beta = std[history.shape[0] - n_new:], beta[history.shape[0] - n_new:]
+
+        return ChunkMetrics(dates, returns, cumulative, std, beta)
+
+    def summary(self):
+        """Mean, variance, annualized std/return, Sharpe and cumulative return so far."""
+        return self.moments.table(self.columns, self.trading_days)
+
+
+def stream_metrics(path=DEFAULT_NAV_PATH, chunk_rows=DEFAULT_CHUNK_ROWS, dtype=np.float64, **engine_options):
+    """Stream a NAV csv, yielding ``(engine, ChunkMetrics)`` for every chunk.
+
+    ``engine.summary()`` after the last chunk gives the full-sample statistics.
+    """
+    engine = StreamingRiskEngine(read_nav_columns(path), **engine_options)
+    for chunk in iter_nav_chunks(path, chunk_rows, dtype):
+        yield engine, engine.process(chunk.dates, chunk.values)
@@ -0,0 +1,38 @@
+"""Synthetic NAV panels shaped like ``whale_navs.csv`` for benchmarks."""
+import numpy as np
+import pandas as pd
+
+from .data import DATE_COLUMN, DATE_FORMAT
+from .metrics import BENCHMARK
+
+
+def generate_navs(rows=1500, funds=4, nan_density=0.0, seed=0, start="2014-10-01"):
+    """Random-walk NAV panel with a business-day index, ``funds`` fund columns and an S&P 500 column.
+
+    Fund returns load on the benchmark with betas drawn from [0, 1.5] plus
+    idiosyncratic noise. ``nan_density`` is the fraction of fund NAVs
+    replaced by NaN to mimic missing prints.
+    """
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.0115, size=rows)
+    betas = rng.uniform(0.0, 1.5, size=funds)
+    noise = rng.normal(0.0, 0.002, size=(rows, funds))
+    fund_returns = market[:, np.newaxis] * betas + noise
+    fund_returns[0] = 0.0
+    market[0] = 0.0
+
+    fund_navs = rng.uniform(10, 100, size=funds) * np.cumprod(1.0 + fund_returns, axis=0)
+    benchmark_navs = 200.0 * np.cumprod(1.0 + market)
+    if nan_density > 0:
+        fund_navs[rng.random(fund_navs.shape) < nan_density] = np.nan
+
+    index = pd.bdate_range(start, periods=rows, name=DATE_COLUMN)
+    navs = pd.DataFrame(fund_navs, index=index, columns=[f"FUND {i:05d}" for i in range(funds)])
+    navs[BENCHMARK] = benchmark_navs
+    return navs
+
+
+def write_navs_csv(navs, path):
+    """Write a panel in the same layout as ``whale_navs.csv``."""
+    navs.to_csv(path, date_format=DATE_FORMAT)
+    return path
@@ -0,0 +1,107 @@
+"""Cached loads must return what load_navs returns, and rebuild when the csv changes."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_return import build_cache, generate_navs, load_navs, load_navs_cached, write_navs_csv
+from risk_return.cache import cache_dir_for
+
+
+def _assert_same(cached, expected):
+    # The index unit of read_csv depends on the pandas version; compare values
+    pd.testing.assert_frame_equal(cached, expected, check_freq=False, check_index_type=False)
+
+
+def _write(path, text):
+    with open(path, "w", newline="") as handle:
+        handle.write(text)
+
+
+@pytest.fixture
+def csv_text(tmp_path):
+    path = tmp_path / "source.csv"
+    write_navs_csv(generate_navs(rows=120, funds=3, seed=10), path)
+    with open(path, newline="") as handle:
+        return handle.read()
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        lambda text: text,
+        lambda text: text + "\n",
+        lambda text: text.replace("\n", "\n\n", 40),
+        lambda text: text.replace("\n", "\r\n"),
+        lambda text: text.rstrip("\n"),
+    ],
+    ids=["plain", "trailing-blank-line", "interior-blank-lines", "crlf", "no-final-newline"],
+)
+@pytest.mark.parametrize("chunk_rows", [7, 100_000])
+def test_cached_load_matches_load_navs(tmp_path, csv_text, layout, chunk_rows):
+    path = tmp_path / "navs.csv"
+    _write(path, layout(csv_text))
+    build_cache(path, chunk_rows=chunk_rows)
+    _assert_same(load_navs_cached(path), load_navs(path))
+
+
+def test_header_only_file(tmp_path):
+    path = tmp_path / "empty.csv"
+    _write(path, "date,FUND 00000,S&P 500\n")
+    cached = load_navs_cached(path)
+    assert cached.shape == (0, 2)
+    assert list(cached.columns) == list(load_navs(path).columns)
+
+
+def test_float32_and_float64_side_by_side(tmp_path, csv_text):
+    path = tmp_path / "navs.csv"
+    _write(path, csv_text)
+    expected = load_navs(path)
+    wide = load_navs_cached(path, dtype=np.float64)
+    narrow = load_navs_cached(path, dtype=np.float32)
+
+    assert narrow.dtypes.eq(np.float32).all()
+    _assert_same(wide, expected)
+    np.testing.assert_allclose(narrow.to_numpy(), expected.to_numpy(), rtol=1e-6)
+    assert {"values-float32.npy", "values-float64.npy"} <= set(os.listdir(cache_dir_for(path)))
+    # Building the second dtype must not invalidate the first
+    _assert_same(load_navs_cached(path, dtype=np.float64), expected)
+
+
+def test_rebuilds_after_size_change(tmp_path, csv_text):
+    path = tmp_path / "navs.csv"
+    _write(path, csv_text)
+    load_navs_cached(path)
+    lines = csv_text.splitlines(keepends=True)
+    _write(path, "".join(lines[:-10]))
+    _assert_same(load_navs_cached(path), load_navs(path))
+    assert len(load_navs_cached(path)) == len(lines) - 11
+
+
+def test_rebuilds_after_mtime_change(tmp_path, csv_text):
+    path = tmp_path / "navs.csv"
+    _write(path, csv_text)
+    load_navs_cached(path)
+    stat = os.stat(path)
+    # Same size, different value and a newer modification time
+    _write(path, csv_text.replace("S&P 500", "S&P 5OO", 1))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    cached = load_navs_cached(path)
+    assert "S&P 5OO" in cached.columns
+    _assert_same(cached, load_navs(path))
+
+
+def test_verify_hash_catches_same_size_and_mtime(tmp_path, csv_text):
+    path = tmp_path / "navs.csv"
+    _write(path, csv_text)
+    load_navs_cached(path, verify_hash=True)
+    stat = os.stat(path)
+    _write(path, csv_text.replace("S&P 500", "S&P 5OO", 1))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    # Without the hash the cache looks fresh and the old columns come back
+    assert "S&P 500" in load_navs_cached(path).columns
+    cached = load_navs_cached(path, verify_hash=True)
+    assert "S&P 5OO" in cached.columns
+    _assert_same(cached, load_navs(path))
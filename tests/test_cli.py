@@ -0,0 +1,26 @@
+"""Bad command-line values must be usage errors, not tracebacks from the metric code."""
+import pytest
+
+from risk_return.cli import parse_args
+
+
+def test_window_lists():
+    args = parse_args(["navs.csv", "--std-windows", "21,63", "--beta-windows", "60"])
+    assert args.std_windows == (21, 63)
+    assert args.beta_windows == (60,)
+
+
+@pytest.mark.parametrize("option", ["--std-windows", "--beta-windows"])
+@pytest.mark.parametrize("value", ["1", "0", "21,1", "-5", "sixty"])
+def test_bad_windows_exit_with_usage_error(capsys, option, value):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["navs.csv", option, value])
+    assert exit_info.value.code == 2
+    assert option in capsys.readouterr().err
+
+
+def test_unknown_frequency_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["navs.csv", "--frequencies", "W,FORTNIGHT"])
+    assert exit_info.value.code == 2
+    assert "FORTNIGHT" in capsys.readouterr().err
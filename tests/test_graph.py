@@ -0,0 +1,45 @@
+"""The graph must not recompute the returns panel per column when the cache cannot hold it."""
+import numpy as np
+import pytest
+
+from risk_return import BENCHMARK, ResultCache, RiskGraph, compute_daily_returns, generate_navs, graph, rolling_beta
+
+
+@pytest.fixture
+def counted_returns(monkeypatch):
+    calls = []
+
+    def counted(frame):
+        calls.append(1)
+        return compute_daily_returns(frame)
+
+    monkeypatch.setattr(graph, "compute_daily_returns", counted)
+    return calls
+
+
+def test_small_cache_computes_returns_once_per_call(counted_returns):
+    navs = generate_navs(rows=300, funds=40, seed=8)
+    # Smaller than the returns panel, so the daily_returns node is never kept
+    risk_graph = RiskGraph(navs, cache=ResultCache(max_bytes=10_000))
+
+    sharpe = risk_graph.sharpe()
+    assert len(counted_returns) == 1
+    risk_graph.rolling_std(window=21)
+    assert len(counted_returns) == 2
+
+    returns = compute_daily_returns(navs)
+    np.testing.assert_allclose(sharpe, returns.mean() * 252 / (returns.std() * np.sqrt(252)), rtol=1e-12)
+
+
+def test_results_match_pandas(counted_returns):
+    navs = generate_navs(rows=300, funds=6, seed=8)
+    risk_graph = RiskGraph(navs, cache=ResultCache())
+    funds = list(navs.columns[:3])
+    returns = compute_daily_returns(navs)
+
+    np.testing.assert_allclose(risk_graph.std(), returns.std(), rtol=1e-12)
+    np.testing.assert_allclose(
+        risk_graph.rolling_beta(funds, window=60), rolling_beta(returns[funds], returns[BENCHMARK], 60), rtol=1e-12,
+    )
+    # Every later node reuses the cached returns
+    assert len(counted_returns) == 1
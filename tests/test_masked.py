@@ -0,0 +1,76 @@
+"""NaN-aware kernels must match pandas' skip-NaN statistics on a ragged panel."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_return import (
+    BENCHMARK,
+    generate_navs,
+    masked_cumulative_returns,
+    masked_daily_returns,
+    masked_rolling_beta,
+    masked_rolling_std,
+    masked_summary,
+)
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+LATE, GAPPED = "FUND 00000", "FUND 00001"
+
+
+@pytest.fixture(scope="module")
+def navs():
+    navs = generate_navs(rows=300, funds=3, seed=13)
+    # A fund launched 80 days in, and one with a 20-day interior gap
+    navs.iloc[:80, navs.columns.get_loc(LATE)] = np.nan
+    navs.iloc[150:170, navs.columns.get_loc(GAPPED)] = np.nan
+    return navs
+
+
+@pytest.fixture(scope="module")
+def returns(navs):
+    return masked_daily_returns(navs)
+
+
+def test_daily_returns_span_gaps(navs, returns):
+    expected = navs / navs.ffill().shift() - 1
+    pd.testing.assert_frame_equal(returns, expected, check_freq=False, rtol=1e-12)
+    assert returns[LATE].iloc[:81].isna().all()
+    assert returns[GAPPED].iloc[150:170].isna().all()
+    # The return after the gap covers the whole gap
+    np.testing.assert_allclose(returns[GAPPED].iloc[170], navs[GAPPED].iloc[170] / navs[GAPPED].iloc[149] - 1)
+
+    growth = masked_cumulative_returns(returns)
+    np.testing.assert_allclose(growth.iloc[-1], navs.iloc[-1] / navs.bfill().iloc[0], rtol=1e-12)
+    assert growth[GAPPED].iloc[150:170].isna().all()
+
+
+def test_summary_matches_pandas(returns):
+    summary = masked_summary(returns)
+    np.testing.assert_array_equal(summary["observations"], returns.count())
+    np.testing.assert_allclose(summary["mean"], returns.mean(), **TOLERANCE)
+    np.testing.assert_allclose(summary["std"], returns.std(), **TOLERANCE)
+    np.testing.assert_allclose(summary["sharpe"], returns.mean() * 252 / (returns.std() * np.sqrt(252)), **TOLERANCE)
+    np.testing.assert_allclose(summary["cumulative_return"], (1 + returns).prod(), **TOLERANCE)
+
+
+@pytest.mark.parametrize("min_periods", [None, 5, 15])
+def test_rolling_std_matches_pandas(returns, min_periods):
+    expected = returns.rolling(21, min_periods=min_periods).std()
+    pd.testing.assert_frame_equal(masked_rolling_std(returns, 21, min_periods), expected, check_freq=False, **TOLERANCE)
+
+
+@pytest.mark.parametrize("min_periods", [None, 10, 40])
+def test_rolling_beta_uses_paired_observations(returns, min_periods):
+    funds = returns.drop(columns=BENCHMARK)
+    benchmark = returns[BENCHMARK]
+    result = masked_rolling_beta(funds, benchmark, 60, min_periods)
+
+    expected = {}
+    for fund in funds:
+        paired = funds[fund].notna() & benchmark.notna()
+        x, y = funds[fund].where(paired), benchmark.where(paired)
+        expected[fund] = x.rolling(60, min_periods=min_periods).cov(y) / y.rolling(60, min_periods=min_periods).var()
+    expected = pd.DataFrame(expected)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, **TOLERANCE)
+    # Windows that straddle the gap have a beta only if min_periods lets them
+    assert result[GAPPED].iloc[150:229].notna().any() == (min_periods is not None)
@@ -0,0 +1,106 @@
+"""Block-wise rolling metrics over .npy memmaps must match pandas on the whole panel."""
+import numpy as np
+import pytest
+
+from risk_return import (
+    build_cache,
+    generate_navs,
+    navs_to_returns_memmap,
+    rolling_beta_memmap,
+    rolling_std_memmap,
+    write_navs_csv,
+)
+from risk_return.outofcore import _tile_shape
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+
+
+@pytest.fixture(scope="module")
+def navs():
+    return generate_navs(rows=700, funds=6, seed=7)
+
+
+@pytest.fixture(scope="module")
+def returns_path(navs, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("outofcore")
+    np.save(directory / "navs.npy", navs.to_numpy())
+    path = directory / "returns.npy"
+    # 1 KB blocks: a handful of rows each, so many block boundaries
+    navs_to_returns_memmap(directory / "navs.npy", path, dtype=np.float64, max_block_bytes=1024)
+    return path
+
+
+def test_returns_match_pct_change(navs, returns_path):
+    returns = np.load(returns_path, mmap_mode="r")
+    np.testing.assert_allclose(returns, navs.pct_change().dropna().to_numpy(), **TOLERANCE)
+
+
+# With 7 columns, 20 KB is ~45 rows per block (shorter than the beta window,
+# so blocks are widened to the window); 200 KB is ~450; 50 MB is one block
+@pytest.mark.parametrize("max_block_bytes", [1, 20_000, 200_000, 50 * 2 ** 20])
+def test_rolling_std_matches_pandas(navs, returns_path, tmp_path, max_block_bytes):
+    expected = navs.pct_change().dropna().rolling(21).std().to_numpy()
+    result = rolling_std_memmap(
+        returns_path, tmp_path / "std.npy", window=21, dtype=np.float64, max_block_bytes=max_block_bytes,
+    )
+    np.testing.assert_allclose(result, expected, **TOLERANCE)
+    np.testing.assert_allclose(np.load(tmp_path / "std.npy"), expected, **TOLERANCE)
+
+
+@pytest.mark.parametrize("max_block_bytes", [1, 20_000, 200_000, 50 * 2 ** 20])
+def test_rolling_beta_matches_pandas(navs, returns_path, tmp_path, max_block_bytes):
+    returns = navs.pct_change().dropna()
+    benchmark = returns.iloc[:, -1]
+    expected = returns.rolling(60).cov(benchmark).div(benchmark.rolling(60).var(), axis=0).to_numpy()
+    result = rolling_beta_memmap(
+        returns_path, -1, tmp_path / "beta.npy", window=60, dtype=np.float64, max_block_bytes=max_block_bytes,
+    )
+    np.testing.assert_allclose(result, expected, **TOLERANCE)
+
+
+def test_float32_output(navs, returns_path, tmp_path):
+    expected = navs.pct_change().dropna().rolling(21).std().to_numpy()
+    result = rolling_std_memmap(returns_path, tmp_path / "std32.npy", window=21, max_block_bytes=20_000)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+
+@pytest.fixture(scope="module")
+def fortran_returns_path(navs, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("fortran")
+    path = directory / "returns_f.npy"
+    np.save(path, np.asfortranarray(navs.pct_change().dropna().to_numpy()))
+    return path
+
+
+def test_fortran_input_is_tiled(fortran_returns_path):
+    returns = np.load(fortran_returns_path, mmap_mode="r")
+    assert returns.flags.f_contiguous
+    rows, width = _tile_shape(returns, 21, 2_000)
+    assert width < returns.shape[1] and rows >= 21
+
+
+@pytest.mark.parametrize("max_block_bytes", [1, 2_000, 50 * 2 ** 20])
+def test_fortran_input_matches_pandas(navs, fortran_returns_path, tmp_path, max_block_bytes):
+    returns = navs.pct_change().dropna()
+    benchmark = returns.iloc[:, -1]
+    options = {"dtype": np.float64, "max_block_bytes": max_block_bytes}
+
+    std = rolling_std_memmap(fortran_returns_path, tmp_path / "std.npy", window=21, **options)
+    np.testing.assert_allclose(std, returns.rolling(21).std().to_numpy(), **TOLERANCE)
+    assert std.flags.c_contiguous
+
+    beta = rolling_beta_memmap(fortran_returns_path, -1, tmp_path / "beta.npy", window=60, **options)
+    expected = returns.rolling(60).cov(benchmark).div(benchmark.rolling(60).var(), axis=0)
+    np.testing.assert_allclose(beta, expected.to_numpy(), **TOLERANCE)
+
+
+def test_returns_from_nav_cache(navs, tmp_path):
+    csv_path = tmp_path / "navs.csv"
+    write_navs_csv(navs, csv_path)
+    cache_values = build_cache(csv_path) / "values-float64.npy"
+    assert np.load(cache_values, mmap_mode="r").flags.f_contiguous
+
+    returns = navs_to_returns_memmap(cache_values, tmp_path / "returns.npy", dtype=np.float64, max_block_bytes=2_000)
+    expected = np.load(cache_values)
+    np.testing.assert_allclose(returns, expected[1:] / expected[:-1] - 1.0, **TOLERANCE)
@@ -0,0 +1,53 @@
+"""The process-pool report must match the single-process functions and clean up its shared memory."""
+import os
+
+import numpy as np
+import pytest
+
+from risk_return import (
+    BENCHMARK,
+    compute_cumulative_returns,
+    compute_daily_returns,
+    fused_summary,
+    generate_navs,
+    parallel_report,
+    rolling_beta,
+    rolling_std,
+)
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+SHM_DIR = "/dev/shm"
+
+
+def _shared_blocks():
+    return {name for name in os.listdir(SHM_DIR) if name.startswith("psm_")}
+
+
+@pytest.fixture(scope="module")
+def navs():
+    return generate_navs(rows=400, funds=5, nan_density=0.01, seed=11)
+
+
+@pytest.mark.skipif(not os.path.isdir(SHM_DIR), reason="POSIX shared memory is listed under /dev/shm")
+def test_two_workers_match_single_process_functions(navs):
+    before = _shared_blocks()
+    report = parallel_report(navs, workers=2)
+    assert _shared_blocks() == before
+
+    returns = compute_daily_returns(navs)
+    assert len(returns) < len(navs) - 1
+    funds = returns.columns.drop(BENCHMARK)
+    expected = {
+        "daily_returns": returns,
+        "cumulative_returns": compute_cumulative_returns(returns),
+        "rolling_std": rolling_std(returns, 21),
+        "rolling_beta": rolling_beta(returns[funds], returns[BENCHMARK], 60),
+        "summary": fused_summary(returns),
+    }
+    assert set(report) == set(expected)
+    for key, frame in expected.items():
+        assert report[key].index.equals(frame.index), key
+        assert list(report[key].columns) == list(frame.columns), key
+        np.testing.assert_allclose(report[key], frame, err_msg=key, **TOLERANCE)
+    np.testing.assert_allclose(report["summary"]["sharpe"], returns.mean() * 252 / (returns.std() * np.sqrt(252)),
+                               **TOLERANCE)
@@ -0,0 +1,60 @@
+"""Prefix-sum range statistics must match pandas on the same slice of returns."""
+import numpy as np
+import pytest
+
+from risk_return import BENCHMARK, PrefixIndex, compute_daily_returns, generate_navs
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+
+
+@pytest.fixture(scope="module")
+def returns():
+    return compute_daily_returns(generate_navs(rows=600, funds=5, seed=9))
+
+
+@pytest.fixture(scope="module")
+def index(returns):
+    return PrefixIndex(returns)
+
+
+def test_range_matches_pandas(returns, index):
+    start, end = "2015-03-01", "2015-11-30"
+    window = returns.loc[start:end]
+    stats = index.stats(start, end)
+
+    assert (stats["observations"] == len(window)).all()
+    np.testing.assert_allclose(stats["mean"], window.mean(), **TOLERANCE)
+    np.testing.assert_allclose(stats["std"], window.std(), **TOLERANCE)
+    np.testing.assert_allclose(stats["sharpe"], window.mean() * 252 / (window.std() * np.sqrt(252)), **TOLERANCE)
+    np.testing.assert_allclose(stats["beta"], window.cov()[BENCHMARK] / window[BENCHMARK].var(), **TOLERANCE)
+    np.testing.assert_allclose(stats["total_return"], (1 + window).prod() - 1, **TOLERANCE)
+
+
+def test_batch_selects_funds(returns, index):
+    funds = [returns.columns[3], returns.columns[1]]
+    starts = returns.index[[0, 100, 250]]
+    ends = returns.index[[99, 400, 500]]
+    result = index.batch(starts, ends, funds)
+
+    assert result.funds == funds
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        window = returns.loc[start:end, funds]
+        np.testing.assert_allclose(result.std[i], window.std(), **TOLERANCE)
+        np.testing.assert_allclose(result.total_return[i], (1 + window).prod() - 1, **TOLERANCE)
+
+
+def test_short_ranges(returns, index):
+    empty = index.stats("2030-01-01", "2030-12-31")
+    assert (empty["observations"] == 0).all()
+    assert empty.drop(columns="observations").isna().all().all()
+
+    day = returns.index[10]
+    single = index.stats(day, day)
+    np.testing.assert_allclose(single["total_return"], returns.loc[day], **TOLERANCE)
+    np.testing.assert_allclose(single["mean"], returns.loc[day], **TOLERANCE)
+    assert single[["std", "sharpe", "beta"]].isna().all().all()
+
+
+def test_unknown_fund(index):
+    with pytest.raises(KeyError, match="NOT A FUND"):
+        index.fund_positions(["NOT A FUND"])
@@ -0,0 +1,110 @@
+"""The HTTP service must answer /metrics like pandas, coalesce duplicate queries and report bad requests."""
+import asyncio
+import json
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import pytest
+
+from risk_return import BENCHMARK, compute_daily_returns, generate_navs, rolling_beta
+from risk_return.server import NavStore, RiskServer
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+
+
+@pytest.fixture(scope="module")
+def navs():
+    return generate_navs(rows=400, funds=4, seed=12)
+
+
+@pytest.fixture(scope="module")
+def store(navs):
+    return NavStore(navs, windows=(21, 60))
+
+
+async def _get(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _serve(store, requests):
+    """Start a server on a free port, run ``requests(server)`` against it and close it."""
+
+    async def run():
+        server = await RiskServer(store).start(port=0)
+        try:
+            return server, await requests(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_metrics_match_pandas(navs, store):
+    funds = [navs.columns[2], navs.columns[0]]
+    target = "/metrics?" + urlencode({"funds": ",".join(funds), "start": "2015-02-01", "end": "2015-09-30"})
+    _, (status, body) = _serve(store, lambda server: _get(server.port, target))
+    assert status == 200
+
+    returns = compute_daily_returns(navs)
+    window = returns.loc["2015-02-01":"2015-09-30"]
+    beta = rolling_beta(returns[funds], returns[BENCHMARK], 60).loc[window.index]
+    assert list(body["funds"]) == funds
+    assert (body["start"], body["end"]) == (str(window.index[0].date()), str(window.index[-1].date()))
+    for fund in funds:
+        result = body["funds"][fund]
+        series = window[fund]
+        assert result["observations"] == len(window)
+        np.testing.assert_allclose(result["annualized_return"], series.mean() * 252, **TOLERANCE)
+        np.testing.assert_allclose(result["annualized_std"], series.std() * np.sqrt(252), **TOLERANCE)
+        np.testing.assert_allclose(result["sharpe"], series.mean() * 252 / (series.std() * np.sqrt(252)), **TOLERANCE)
+        np.testing.assert_allclose(result["beta"], series.cov(window[BENCHMARK]) / window[BENCHMARK].var(), **TOLERANCE)
+        np.testing.assert_allclose(result["total_return"], (1 + series).prod() - 1, **TOLERANCE)
+        np.testing.assert_allclose(result["rolling_beta_60_mean"], beta[fund].mean(), **TOLERANCE)
+        np.testing.assert_allclose(result["rolling_beta_60_last"], beta[fund].iloc[-1], **TOLERANCE)
+
+
+def test_identical_concurrent_queries_are_coalesced(navs, monkeypatch):
+    store = NavStore(navs)
+    query = store.query
+    calls = []
+
+    def slow_query(**params):
+        calls.append(params)
+        time.sleep(0.2)
+        return query(**params)
+
+    monkeypatch.setattr(store, "query", slow_query)
+    target = "/metrics?" + urlencode({"funds": navs.columns[1], "start": "2015-01-01"})
+
+    async def requests(server):
+        return await asyncio.gather(*[_get(server.port, target) for _ in range(5)])
+
+    server, responses = _serve(store, requests)
+    assert len(calls) == 1
+    assert server.coalesced == 4
+    assert all(status == 200 for status, _ in responses)
+    assert all(body == responses[0][1] for _, body in responses)
+
+
+@pytest.mark.parametrize(
+    "target, status",
+    [
+        ("/metrics?window=5", 400),
+        ("/metrics?window=sixty", 400),
+        ("/metrics?funds=NOT+A+FUND", 400),
+        ("/metrics?start=not-a-date", 400),
+        ("/metrics?start=2015-03-02&end=2015-03-02", 400),
+        ("/nowhere", 404),
+    ],
+)
+def test_bad_requests(store, target, status):
+    _, (code, body) = _serve(store, lambda server: _get(server.port, target))
+    assert code == status
+    assert body["error"]
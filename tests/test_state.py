@@ -0,0 +1,85 @@
+"""Day-by-day appends, with save/load round trips, must match pandas on the full history."""
+import numpy as np
+import pytest
+
+from risk_return import BENCHMARK, RiskState, generate_navs
+
+# The running window sums are not centered, so allow for some cancellation
+TOLERANCE = {"rtol": 1e-7, "atol": 1e-12}
+
+
+@pytest.fixture(scope="module")
+def navs():
+    return generate_navs(rows=500, funds=4, seed=6)
+
+
+def _expected(navs):
+    returns = navs.pct_change().dropna()
+    funds = returns.drop(columns=BENCHMARK)
+    benchmark = returns[BENCHMARK]
+    annualized_std = returns.expanding(2).std() * np.sqrt(252)
+    return {
+        "daily_return": returns,
+        "cumulative_return": (1 + returns).cumprod(),
+        "annualized_std": annualized_std,
+        "sharpe": returns.expanding(2).mean() * 252 / annualized_std,
+        "rolling_std": returns.rolling(21).std(),
+        "rolling_beta": funds.rolling(60).cov(benchmark).div(benchmark.rolling(60).var(), axis=0),
+    }
+
+
+@pytest.mark.parametrize("seed_rows, save_every", [(1, 100), (80, 100), (80, 37), (200, None)])
+def test_appends_match_pandas(navs, tmp_path, seed_rows, save_every):
+    state = RiskState.from_navs(navs.iloc[:seed_rows])
+    path = tmp_path / "state.npz"
+    days = []
+    for appended, (date, row) in enumerate(navs.iloc[seed_rows:].iterrows(), start=1):
+        days.append(state.update(date, row.to_numpy()))
+        if save_every and appended % save_every == 0:
+            state.save(path)
+            state = RiskState.load(path)
+
+    expected = _expected(navs)
+    dates = [day.date for day in days]
+    assert dates == list(navs.index[seed_rows:])
+    for field, frame in expected.items():
+        actual = np.array([getattr(day, field) for day in days])
+        np.testing.assert_allclose(actual, frame.loc[dates].to_numpy(), err_msg=field, **TOLERANCE)
+
+
+def test_from_navs_matches_appending(navs):
+    appended = RiskState(navs.columns)
+    for date, row in navs.iterrows():
+        appended.update(date, row.to_numpy())
+    built = RiskState.from_navs(navs)
+
+    np.testing.assert_allclose(built._rolling_std(), appended._rolling_std(), **TOLERANCE)
+    np.testing.assert_allclose(built._rolling_beta(), appended._rolling_beta(), **TOLERANCE)
+    np.testing.assert_allclose(built.moments.growth, appended.moments.growth, **TOLERANCE)
+
+
+def test_missing_navs_skip_the_day(navs):
+    state = RiskState.from_navs(navs.iloc[:100])
+    row = navs.iloc[100].to_numpy().copy()
+    row[0] = np.nan
+    assert state.update(navs.index[100], row) is None
+    # The return after the gap is also NaN, as in pct_change(fill_method=None)
+    assert state.update(navs.index[101], navs.iloc[101].to_numpy()) is None
+    assert state.update(navs.index[102], navs.iloc[102].to_numpy()) is not None
+
+
+@pytest.mark.parametrize("offset", [0, -1])
+def test_repeated_or_older_date_is_rejected(navs, tmp_path, offset):
+    state = RiskState.from_navs(navs.iloc[:100])
+    state.update(navs.index[100], navs.iloc[100].to_numpy())
+    path = tmp_path / "state.npz"
+    state.save(path)
+    state = RiskState.load(path)
+
+    with pytest.raises(ValueError, match="not after"):
+        state.update(navs.index[100 + offset], navs.iloc[100].to_numpy())
+    # The rejected call leaves the state untouched
+    day = state.update(navs.index[101], navs.iloc[101].to_numpy())
+    expected = _expected(navs)
+    np.testing.assert_allclose(day.rolling_std, expected["rolling_std"].loc[navs.index[101]], **TOLERANCE)
+    np.testing.assert_allclose(day.annualized_std, expected["annualized_std"].loc[navs.index[101]], **TOLERANCE)
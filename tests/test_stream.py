@@ -0,0 +1,56 @@
+"""Chunked streaming must match pandas on the whole file, whatever the chunk size."""
+import numpy as np
+import pytest
+
+from risk_return import BENCHMARK, generate_navs, load_navs, stream_metrics, write_navs_csv
+
+
+# Returns near zero differ from pandas by a few ULPs
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+
+
+@pytest.fixture(scope="module")
+def nav_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp("navs") / "navs.csv"
+    write_navs_csv(generate_navs(rows=400, funds=5, seed=4), path)
+    return path
+
+
+def _stream(path, chunk_rows):
+    chunks = []
+    engine = None
+    for engine, chunk in stream_metrics(path, chunk_rows=chunk_rows, std_window=21, beta_window=60):
+        chunks.append(chunk)
+    return engine, [np.concatenate(field) for field in zip(*chunks)]
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 50, 59, 60, 1000])
+def test_stream_matches_pandas(nav_csv, chunk_rows):
+    engine, (dates, returns, cumulative, std, beta) = _stream(nav_csv, chunk_rows)
+
+    expected = load_navs(nav_csv).pct_change().dropna()
+    funds = expected.drop(columns=BENCHMARK)
+    benchmark = expected[BENCHMARK]
+    expected_beta = funds.rolling(60).cov(benchmark).div(benchmark.rolling(60).var(), axis=0)
+
+    np.testing.assert_array_equal(dates, expected.index.to_numpy(dtype="datetime64[ns]"))
+    np.testing.assert_allclose(returns, expected.to_numpy(), **TOLERANCE)
+    np.testing.assert_allclose(cumulative, (1 + expected).cumprod().to_numpy(), **TOLERANCE)
+    np.testing.assert_allclose(std, expected.rolling(21).std().to_numpy(), **TOLERANCE)
+    np.testing.assert_allclose(beta, expected_beta.to_numpy(), **TOLERANCE)
+
+    summary = engine.summary()
+    np.testing.assert_allclose(summary["annualized_std"], expected.std() * np.sqrt(252), **TOLERANCE)
+    np.testing.assert_allclose(summary["cumulative_return"], (1 + expected).prod(), **TOLERANCE)
+
+
+def test_stream_drops_dates_with_missing_navs(tmp_path):
+    path = tmp_path / "gappy.csv"
+    write_navs_csv(generate_navs(rows=300, funds=4, nan_density=0.02, seed=5), path)
+    _, (dates, returns, _, std, _) = _stream(path, 13)
+
+    expected = load_navs(path).pct_change(fill_method=None).dropna()
+    np.testing.assert_array_equal(dates, expected.index.to_numpy(dtype="datetime64[ns]"))
+    np.testing.assert_allclose(returns, expected.to_numpy(), **TOLERANCE)
+    np.testing.assert_allclose(std, expected.rolling(21).std().to_numpy(), **TOLERANCE)
+    assert len(dates) < 299
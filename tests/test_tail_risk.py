@@ -0,0 +1,74 @@
+"""Historical VaR/CVaR and rolling drawdowns must match numpy/pandas, whatever the block budget."""
+import numpy as np
+import pytest
+
+from risk_return import (
+    compute_cumulative_returns,
+    compute_daily_returns,
+    generate_navs,
+    historical_cvar,
+    historical_var,
+    rolling_historical_cvar,
+    rolling_historical_var,
+    rolling_max_drawdown,
+)
+
+TOLERANCE = {"rtol": 1e-9, "atol": 1e-14}
+# One window per block, a few dozen rows per block, and everything in one block
+BLOCK_BUDGETS = [1, 20_000, 64 * 2 ** 20]
+
+
+@pytest.fixture(scope="module")
+def returns():
+    return compute_daily_returns(generate_navs(rows=500, funds=4, seed=14))
+
+
+def _worst_mean(values, level):
+    count = max(1, int(np.ceil(len(values) * (1 - level) - 1e-9)))
+    return np.sort(values)[:count].mean()
+
+
+@pytest.mark.parametrize("level", [0.95, 0.99, 0.5])
+def test_historical_var_and_cvar(returns, level):
+    values = returns.to_numpy()
+    np.testing.assert_allclose(historical_var(returns, level), -np.quantile(values, 1 - level, axis=0), **TOLERANCE)
+    np.testing.assert_allclose(
+        historical_cvar(returns, level), [-_worst_mean(column, level) for column in values.T], **TOLERANCE,
+    )
+    # A single series gives a scalar
+    np.testing.assert_allclose(historical_var(returns.iloc[:, 0], level), -np.quantile(values[:, 0], 1 - level))
+
+
+@pytest.mark.parametrize("window", [20, 60])
+def test_rolling_var_and_cvar_match_pandas(returns, window):
+    var = returns.rolling(window).quantile(0.05)
+    cvar = returns.rolling(window).apply(lambda values: _worst_mean(values, 0.95), raw=True)
+    var_results = [rolling_historical_var(returns, window, max_block_bytes=budget) for budget in BLOCK_BUDGETS]
+    cvar_results = [rolling_historical_cvar(returns, window, max_block_bytes=budget) for budget in BLOCK_BUDGETS]
+
+    np.testing.assert_allclose(var_results[0], -var, **TOLERANCE)
+    np.testing.assert_allclose(cvar_results[0], -cvar, **TOLERANCE)
+    # The block budget only changes how the windows are batched, not the arithmetic
+    for result in var_results[1:]:
+        np.testing.assert_array_equal(result, var_results[0])
+    for result in cvar_results[1:]:
+        np.testing.assert_array_equal(result, cvar_results[0])
+
+
+def test_rolling_windows_longer_than_the_data(returns):
+    short = returns.iloc[:10]
+    assert rolling_historical_var(short, 60).isna().all().all()
+    assert rolling_historical_cvar(short, 60).isna().all().all()
+    assert rolling_max_drawdown(compute_cumulative_returns(short), 60).isna().all().all()
+
+
+@pytest.mark.parametrize("window", [2, 21, 252])
+def test_rolling_max_drawdown_matches_pandas(returns, window):
+    cumulative = compute_cumulative_returns(returns)
+    expected = cumulative.rolling(window).apply(
+        lambda values: (values / np.maximum.accumulate(values) - 1).min(), raw=True,
+    )
+    result = rolling_max_drawdown(cumulative, window)
+    np.testing.assert_allclose(result, expected, **TOLERANCE)
+    assert result.iloc[:window - 1].isna().all().all()
+    assert (result.iloc[window - 1:] <= 0).all().all()